@@ -0,0 +1,93 @@
+"""Simulated providers: adapters, selectors and reporters without network.
+
+Latencies are slept on the event loop, so the framework overhead is what
+remains once they are subtracted.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from mc_arc.interfaces import AgentResponse, Message
+
+
+class ProviderError(Exception):
+    pass
+
+
+@dataclass
+class Profile:
+    """Timing of a simulated provider.
+
+    `tokens_per_second` of 0 streams as fast as the event loop allows.
+    """
+
+    ttft: float = 0.0
+    tokens_per_second: float = 0.0
+    chunk_size: int = 4
+    error_rate: float = 0.0
+    seed: int | None = None
+
+    def rng(self) -> random.Random:
+        return random.Random(self.seed)
+
+
+async def _first_token(profile: Profile, rng: random.Random):
+    await asyncio.sleep(profile.ttft)
+
+    if rng.random() < profile.error_rate:
+        raise ProviderError("simulated provider error")
+
+
+class FakeAdapter:
+    def __init__(self, profile: Profile, reply_tokens: int = 64):
+        self.profile = profile
+        self.reply_tokens = reply_tokens
+        self.rng = profile.rng()
+        self.calls = 0
+
+    def __call__(self, message_summary: str) -> AgentResponse:
+        self.calls += 1
+
+        return self._stream_response()
+
+    async def _stream_response(self) -> AgentResponse:
+        profile = self.profile
+
+        await _first_token(profile, self.rng)
+
+        rate = profile.tokens_per_second
+        delay = profile.chunk_size / rate if rate else 0
+        chunk = "tok " * profile.chunk_size
+
+        for _ in range(0, self.reply_tokens, profile.chunk_size):
+            # a zero delay still yields to the loop, like a network read.
+            await asyncio.sleep(delay)
+            yield chunk
+
+
+class FakeSelector:
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        self.rng = profile.rng()
+
+    async def __call__(self, participants: list[str], messages: list[Message]) -> str:
+        await _first_token(self.profile, self.rng)
+
+        return self.rng.choice(participants)
+
+
+class FakeReporter:
+    def __init__(self, profile: Profile, report_tokens: int = 32):
+        self.profile = profile
+        self.report_tokens = report_tokens
+        self.rng = profile.rng()
+
+    async def __call__(self, name: str, messages: list[Message]) -> str:
+        profile = self.profile
+
+        await _first_token(profile, self.rng)
+
+        if profile.tokens_per_second:
+            await asyncio.sleep(self.report_tokens / profile.tokens_per_second)
+
+        return f"{len(messages)} messages since {name} last spoke"
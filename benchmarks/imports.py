@@ -0,0 +1,57 @@
+"""Import time of the mc_arc packages, each measured in a fresh interpreter.
+
+Fails when importing a package loads a provider sdk.
+
+Usage: python -m benchmarks.imports
+"""
+
+import statistics
+import subprocess
+import sys
+
+PACKAGES = ("mc_arc", "mc_arc.selectors", "mc_arc.reporters", "mc_arc.adapters")
+PROVIDER_SDKS = ("google.genai", "openai", "anthropic", "pydantic_ai")
+RUNS = 10
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {package}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {sdks!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(package: str) -> tuple[float, list[str]]:
+    script = SCRIPT.format(package=package, sdks=PROVIDER_SDKS)
+    timings = []
+    loaded = []
+
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1].split(",") if len(output) > 1 else []
+
+    return statistics.median(timings), loaded
+
+
+def main():
+    failed = False
+
+    for package in PACKAGES:
+        elapsed, loaded = measure(package)
+        failed = failed or bool(loaded)
+        print(
+            f"package={package:<18} median={elapsed * 1e3:.2f}ms "
+            f"sdks={','.join(loaded) or '-'}"
+        )
+
+    if failed:
+        sys.exit("importing mc_arc packages loaded a provider sdk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Per-chunk cost of StreamingResponse for growing response sizes.
+
+Usage: python -m benchmarks.streaming
+"""
+
+import asyncio
+import time
+from mc_arc.response import StreamingResponse
+
+
+async def chunks(count: int, size: int):
+    for _ in range(count):
+        yield "x" * size
+
+
+async def consume(count: int, size: int, cumulative: bool) -> float:
+    response = StreamingResponse("bench", chunks(count, size), cumulative)
+
+    start = time.perf_counter()
+
+    async with response as stream:
+        async for _ in stream:
+            pass
+
+    response.get_full_response()
+
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    for cumulative in (False, True):
+        for count in (1_000, 10_000, 100_000):
+            per_chunk = asyncio.run(consume(count, 8, cumulative))
+            print(
+                f"cumulative={cumulative!s:<5} chunks={count:<7} "
+                f"per_chunk={per_chunk * 1e6:.2f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Framework overhead of MasterOfCeremony.step() against simulated providers.
+
+Runs step loops across roster sizes, timeline lengths and concurrent
+sessions, and reports turns/s, inter-turn latency, event-loop lag and peak
+RSS. Peak RSS is the high-water mark of the whole process so far.
+
+Usage: python -m benchmarks.suite [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+import time
+from dataclasses import asdict
+from benchmarks.fakes import (
+    FakeAdapter,
+    FakeReporter,
+    FakeSelector,
+    Profile,
+    ProviderError,
+)
+from mc_arc import MasterOfCeremony, Participant
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # bytes on macos, kilobytes elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def build_session(
+    roster: int, timeline: int, profile: Profile, reporter: bool, seed: int
+) -> MasterOfCeremony:
+    def offset(profile: Profile, n: int) -> Profile:
+        seed = None if profile.seed is None else profile.seed + n
+        return Profile(**{**asdict(profile), "seed": seed})
+
+    participants = [
+        Participant(
+            f"agent_{i}",
+            FakeAdapter(offset(profile, seed + i)),
+            FakeReporter(offset(profile, seed + i)) if reporter else None,
+        )
+        for i in range(roster)
+    ]
+
+    mc = MasterOfCeremony(FakeSelector(offset(profile, seed)), participants)
+
+    for i in range(timeline):
+        mc.add_message(f"agent_{i % roster}", f"message {i} " + "tok " * 16)
+
+    return mc
+
+
+async def monitor_lag(lags: list[float], interval: float = 0.005):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def drive(mc: MasterOfCeremony, turns: int, latencies: list[float]) -> int:
+    errors = 0
+    last = time.perf_counter()
+
+    for _ in range(turns):
+        try:
+            async with mc.step() as stream:
+                async for _ in stream:
+                    pass
+        except ProviderError:
+            errors += 1
+
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+
+    return errors
+
+
+async def run_config(
+    roster: int,
+    timeline: int,
+    sessions: int,
+    turns: int,
+    profile: Profile,
+    reporter: bool,
+) -> dict:
+    mcs = [
+        build_session(roster, timeline, profile, reporter, seed=s * roster)
+        for s in range(sessions)
+    ]
+
+    latencies: list[float] = []
+    lags: list[float] = []
+    monitor = asyncio.create_task(monitor_lag(lags))
+
+    start = time.perf_counter()
+
+    try:
+        errors = await asyncio.gather(*[drive(mc, turns, latencies) for mc in mcs])
+    finally:
+        elapsed = time.perf_counter() - start
+        monitor.cancel()
+
+    return {
+        "roster": roster,
+        "timeline": timeline,
+        "sessions": sessions,
+        "turns": len(latencies),
+        "errors": sum(errors),
+        "elapsed": elapsed,
+        "turns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99),
+        "loop_lag_p99": percentile(lags, 0.99),
+        "loop_lag_max": max(lags, default=0.0),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def integers(value: str) -> list[int]:
+    return [int(v) for v in value.split(",")]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rosters", type=integers, default=[2, 8, 32])
+    parser.add_argument("--timelines", type=integers, default=[0, 1_000, 10_000])
+    parser.add_argument("--sessions", type=integers, default=[1, 16, 64])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--ttft", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reporter", action="store_true", help="use fake reporters")
+    parser.add_argument("--json", help="write the results to this path, - for stdout")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    profile = Profile(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        chunk_size=args.chunk_size,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    results = []
+
+    for sessions in args.sessions:
+        for roster in args.rosters:
+            for timeline in args.timelines:
+                result = asyncio.run(
+                    run_config(
+                        roster, timeline, sessions, args.turns, profile, args.reporter
+                    )
+                )
+                results.append(result)
+
+                print(
+                    f"sessions={sessions:<4} roster={roster:<4} timeline={timeline:<6} "
+                    f"turns/s={result['turns_per_second']:<9.1f} "
+                    f"p50={result['latency_p50'] * 1e3:.2f}ms "
+                    f"p99={result['latency_p99'] * 1e3:.2f}ms "
+                    f"lag_p99={result['loop_lag_p99'] * 1e3:.2f}ms "
+                    f"rss={result['peak_rss_mb']:.1f}MB",
+                    file=sys.stderr if args.json == "-" else sys.stdout,
+                )
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "turns": args.turns,
+            "reporter": args.reporter,
+            "profile": asdict(profile),
+            "results": results,
+        }
+
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+        else:
+            with open(args.json, "w") as file:
+                json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
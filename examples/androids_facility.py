@@ -80,7 +80,7 @@ async def cli_run(mc: MasterOfCeremony, player: str):
         async with mc.step() as stream:
             output = ""
             async for name, chunk in stream:
-                for char in list(chunk):
+                for char in chunk:
                     output += char
                     clear(mc.timeline)
                     out_line(name, output.strip())
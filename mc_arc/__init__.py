@@ -1,8 +1,34 @@
 from .mc import MasterOfCeremony
 from .participant import Participant
+from .timeline import Timeline
+from .response import StreamingResponse, Coalescing, CumulativeText
+from .persistence import PersistentTimeline, TimelineLog
+from .limits import RateLimiter, RateLimits, default_limits
+from .scheduler import SessionScheduler
+from .clients import ClientRegistry, default_clients
+from .instrumentation import (
+    Event,
+    Instrumentation,
+    OpenTelemetrySubscriber,
+    default_instrumentation,
+)
+from .hedging import Hedging
+from .export import ParquetExporter
+from .retrieval import RetrievalIndex, BM25Index
+from .history import HistoryPolicy, SlidingWindow, Summarize, Turn
+from .usage import (
+    Usage,
+    Price,
+    Budget,
+    BudgetExceeded,
+    UsageTracker,
+    default_usage,
+)
 from .interfaces import (
     Selector,
+    AsyncSelector,
     Reporter,
+    AsyncReporter,
     AgentResponse,
     AgentAdapter,
     Message,
@@ -11,8 +37,40 @@ from .interfaces import (
 __all__ = [
     "MasterOfCeremony",
     "Participant",
+    "Timeline",
+    "StreamingResponse",
+    "Coalescing",
+    "CumulativeText",
+    "PersistentTimeline",
+    "TimelineLog",
+    "RateLimiter",
+    "RateLimits",
+    "default_limits",
+    "SessionScheduler",
+    "ClientRegistry",
+    "default_clients",
+    "Event",
+    "Instrumentation",
+    "OpenTelemetrySubscriber",
+    "default_instrumentation",
+    "Hedging",
+    "ParquetExporter",
+    "RetrievalIndex",
+    "BM25Index",
+    "HistoryPolicy",
+    "SlidingWindow",
+    "Summarize",
+    "Turn",
+    "Usage",
+    "Price",
+    "Budget",
+    "BudgetExceeded",
+    "UsageTracker",
+    "default_usage",
     "Selector",
+    "AsyncSelector",
     "Reporter",
+    "AsyncReporter",
     "AgentResponse",
     "AgentAdapter",
     "Message",
@@ -1,4 +1,16 @@
-from .genai import GenaiAdapter
-from .pydantic_ai import PydanticAiAdapter
+from typing import TYPE_CHECKING
+from mc_arc.utils import lazy_exports
+
+# adapters are loaded on first access, with their provider sdk.
+_EXPORTS = {
+    "GenaiAdapter": ".genai",
+    "PydanticAiAdapter": ".pydantic_ai",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .genai import GenaiAdapter
+    from .pydantic_ai import PydanticAiAdapter
 
 __all__ = ["GenaiAdapter", "PydanticAiAdapter"]
@@ -1,27 +1,158 @@
-from google import genai
-from google.genai import types
+import asyncio
+from mc_arc.history import HistoryPolicy, Turn
+from mc_arc.clients import ClientRegistry, default_clients
 from mc_arc.interfaces import AgentResponse
+from mc_arc.prompts import HISTORY_SUMMARY_TEMPLATE
+from mc_arc.limits import RateLimits, default_limits
+from mc_arc.speculation import PendingCommit
+from mc_arc.tokens import estimate_tokens
+from mc_arc.usage import SPEAKER, Usage, UsageTracker, default_usage
 
 
 class GenaiAdapter:
     def __init__(
-        self, model: str, system_prompt: str, api_key: str | None = None, tools=None
+        self,
+        model: str,
+        system_prompt: str,
+        api_key: str | None = None,
+        tools=None,
+        limits: RateLimits | None = None,
+        clients: ClientRegistry | None = None,
+        usage: UsageTracker | None = None,
+        history: HistoryPolicy | None = None,
+        reply_tokens: int = 512,
     ):
-        client = genai.Client(api_key=api_key)
-
-        self.chat = client.aio.chats.create(
-            model=model,
-            config=types.GenerateContentConfig(
-                system_instruction=system_prompt,
-                tools=tools or [],
-            ),
+        self.client = (clients or default_clients).gemini(api_key)
+        self.model = model
+        self.limits = limits or default_limits
+        # reserved for the reply until the actual usage is known.
+        self.reply_tokens = reply_tokens
+        self.usage = usage or default_usage
+        self.history = history
+
+        from google.genai import types
+
+        self.config = types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            tools=tools or [],
         )
+        self.chat = self.client.aio.chats.create(model=model, config=self.config)
 
     def __call__(self, message_summary: str) -> AgentResponse:
-        return self._stream_response(message_summary)
+        return self._stream_response(self.chat, message_summary, self._set_chat)
+
+    def draft(self, message_summary: str):
+        # drafts run on a copy of the chat, kept only when accepted.
+        chat = self.client.aio.chats.create(
+            model=self.model, config=self.config, history=self.chat.get_history()
+        )
+        pending = PendingCommit(self._set_chat)
+
+        return (
+            self._stream_response(chat, message_summary, pending.resolve),
+            pending.accept,
+        )
+
+    def _set_chat(self, chat):
+        self.chat = chat
+
+    async def _stream_response(self, chat, message_summary: str, on_complete):
+        tokens = self._prompt_tokens(chat, message_summary) + self.reply_tokens
+
+        async with self.limits.limit("gemini", self.model, tokens) as lease:
+            stream = await chat.send_message_stream(message_summary)
+            chunks = lease.stream(stream)
+            usage = None
+            texts: list[str] = []
+
+            try:
+                async for chunk in chunks:
+                    # usage metadata is cumulative, the last chunk has the totals.
+                    usage = Usage.from_gemini(chunk) or usage
+                    texts.append(chunk.text or "")
+                    yield texts[-1]
+            except (GeneratorExit, asyncio.CancelledError):
+                # the chat only records complete replies, the partial one is
+                # added to a new chat.
+                await chunks.aclose()
+                await stream.aclose()
+                self._record(lease, usage)
+                on_complete(self._interrupted(chat, message_summary, "".join(texts)))
+                raise
+
+            self._record(lease, usage)
+
+        # bounded outside of the rate limit, summarizers make their own requests.
+        on_complete(await self._bound(chat))
+
+    def _prompt_tokens(self, chat, message_summary: str) -> int:
+        # the whole bounded history is sent along with every message.
+        texts = [str(self.config.system_instruction or ""), message_summary]
+        texts += [
+            part.text
+            for content in chat.get_history()
+            for part in content.parts or []
+            if part.text
+        ]
+
+        return sum(map(estimate_tokens, texts))
+
+    def _record(self, lease, usage: Usage | None):
+        self.usage.record(SPEAKER, "gemini", self.model, usage)
+
+        if usage:
+            lease.settle(usage.total_tokens)
 
-    async def _stream_response(self, message_summary: str):
-        stream = await self.chat.send_message_stream(message_summary)
+    def _interrupted(self, chat, message_summary: str, text: str):
+        from google.genai import types
 
-        async for chunk in stream:
-            yield chunk.text or ""
+        history = [
+            *chat.get_history(),
+            types.Content(role="user", parts=[types.Part(text=message_summary)]),
+        ]
+
+        if text:
+            history.append(types.Content(role="model", parts=[types.Part(text=text)]))
+
+        return self.client.aio.chats.create(
+            model=self.model, config=self.config, history=history
+        )
+
+    async def _bound(self, chat):
+        if not self.history:
+            return chat
+
+        from google.genai import types
+
+        contents = chat.get_history()
+        turns: list[Turn] = []
+
+        for content in contents:
+            text = "\n".join([p.text for p in content.parts or [] if p.text])
+            line = f"{content.role}: {text}"
+
+            # a turn starts with each user prompt, not with function responses.
+            if not turns or (content.role == "user" and text):
+                turns.append(Turn([], "", 0))
+
+            turn = turns[-1]
+            turn.messages.append(content)
+            turn.text = f"{turn.text}\n{line}" if turn.text else line
+            turn.tokens += estimate_tokens(text)
+
+        kept, summary = await self.history.apply(turns)
+
+        if len(kept) == len(turns) and summary is None:
+            return chat
+
+        # the system prompt is part of the config, it is always kept.
+        history = [content for turn in kept for content in turn.messages]
+
+        if summary:
+            first = history[0]
+            part = types.Part(text=HISTORY_SUMMARY_TEMPLATE(summary))
+            history[0] = types.Content(role=first.role, parts=[part, *first.parts])
+
+        return self.client.aio.chats.create(
+            model=self.model, config=self.config, history=history
+        )
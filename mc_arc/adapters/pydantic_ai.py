@@ -1,23 +1,163 @@
-from pydantic_ai import Agent
+import asyncio
+from dataclasses import replace
+from typing import TYPE_CHECKING
+from mc_arc.history import HistoryPolicy, Turn
 from mc_arc.interfaces import AgentResponse
+from mc_arc.prompts import HISTORY_SUMMARY_TEMPLATE
+from mc_arc.limits import RateLimits, default_limits
+from mc_arc.speculation import PendingCommit
+from mc_arc.tokens import estimate_tokens
+from mc_arc.usage import SPEAKER, Usage, UsageTracker, default_usage
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 
 class PydanticAiAdapter:
-    def __init__(self, agent: Agent):
+    def __init__(
+        self,
+        agent: "Agent",
+        limits: RateLimits | None = None,
+        usage: UsageTracker | None = None,
+        history: HistoryPolicy | None = None,
+        reply_tokens: int = 512,
+    ):
         self.agent = agent
+        self.limits = limits or default_limits
+        # reserved for the reply until the actual usage is known.
+        self.reply_tokens = reply_tokens
+        self.usage = usage or default_usage
+        self.history = history
         self.message_history = []
 
     def __call__(self, message_summary: str) -> AgentResponse:
-        return self._stream_response(message_summary)
-
-    async def _stream_response(self, message_summary: str):
-        response = self.agent.run_stream(
-            message_summary, message_history=self.message_history
-        )
-
-        offset = 0
-        async with response as result:
-            async for chunk in result.stream():
-                yield chunk[offset:]
-                offset = len(chunk)
-            self.message_history = result.all_messages()
+        return self._stream_response(message_summary, self._set_history)
+
+    def draft(self, message_summary: str):
+        # the history only moves forward when the draft is accepted.
+        pending = PendingCommit(self._set_history)
+
+        return self._stream_response(message_summary, pending.resolve), pending.accept
+
+    def _set_history(self, message_history: list):
+        self.message_history = message_history
+
+    def _provider_model(self) -> tuple[str, str | None]:
+        # pydantic ai models are named "provider:model" or are model instances.
+        model = self.agent.model
+
+        if isinstance(model, str):
+            provider, _, name = model.rpartition(":")
+            return provider, name
+
+        return getattr(model, "system", "") or "", getattr(model, "model_name", None)
+
+    async def _stream_response(self, message_summary: str, on_complete):
+        provider, model = self._provider_model()
+        tokens = self._prompt_tokens(message_summary) + self.reply_tokens
+
+        async with self.limits.limit(provider, model, tokens) as lease:
+            response = self.agent.run_stream(
+                message_summary, message_history=self.message_history
+            )
+
+            offset = 0
+            text = ""
+            async with response as result:
+                chunks = lease.stream(result.stream())
+
+                try:
+                    async for chunk in chunks:
+                        text = chunk
+                        yield chunk[offset:]
+                        offset = len(chunk)
+                except (GeneratorExit, asyncio.CancelledError):
+                    # an interrupted reply is kept as far as it was streamed.
+                    await chunks.aclose()
+                    self._record(lease, provider, model, result)
+                    on_complete(_interrupted(result.all_messages(), text))
+                    raise
+                self._record(lease, provider, model, result)
+                messages = result.all_messages()
+
+        # bounded outside of the rate limit, summarizers make their own requests.
+        on_complete(await self._bound(messages))
+
+    def _prompt_tokens(self, message_summary: str) -> int:
+        # the whole bounded history is sent along with every message.
+        texts = [message_summary] + [
+            part.content
+            for message in self.message_history
+            for part in message.parts
+            if _has_text(part)
+        ]
+
+        return sum(map(estimate_tokens, texts))
+
+    def _record(self, lease, provider: str, model: str | None, result):
+        usage = Usage.from_pydantic_ai(result.usage())
+        self.usage.record(SPEAKER, provider, model, usage)
+
+        if usage:
+            lease.settle(usage.total_tokens)
+
+    async def _bound(self, messages: list) -> list:
+        if not self.history or not messages:
+            return messages
+
+        from pydantic_ai.messages import ModelRequest, SystemPromptPart, UserPromptPart
+
+        turns: list[Turn] = []
+
+        for message in messages:
+            parts = message.parts
+            text = "\n".join(
+                [f"{p.part_kind}: {p.content}" for p in parts if _has_text(p)]
+            )
+
+            # a turn starts with each user prompt.
+            if not turns or (
+                isinstance(message, ModelRequest)
+                and any([isinstance(p, UserPromptPart) for p in parts])
+            ):
+                turns.append(Turn([], "", 0))
+
+            turn = turns[-1]
+            turn.messages.append(message)
+            turn.text = "\n".join([t for t in [turn.text, text] if t])
+            turn.tokens += estimate_tokens(text)
+
+        kept, summary = await self.history.apply(turns)
+
+        if len(kept) == len(turns) and summary is None:
+            return messages
+
+        history = [message for turn in kept for message in turn.messages]
+
+        # pydantic ai only adds the system prompt to an empty history.
+        first = history[0]
+        system = [p for p in messages[0].parts if isinstance(p, SystemPromptPart)]
+        prefix = system if self.history.pin_system_prompt else []
+
+        if summary:
+            prefix = prefix + [UserPromptPart(HISTORY_SUMMARY_TEMPLATE(summary))]
+
+        if isinstance(first, ModelRequest) and prefix:
+            parts = [p for p in first.parts if not isinstance(p, SystemPromptPart)]
+            history[0] = replace(first, parts=prefix + parts)
+
+        return history
+
+
+def _interrupted(messages: list, text: str) -> list:
+    from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart
+
+    # the response is only added to the messages once complete.
+    if text and messages and isinstance(messages[-1], ModelRequest):
+        return [*messages, ModelResponse(parts=[TextPart(text)])]
+
+    return messages
+
+
+def _has_text(part) -> bool:
+    return isinstance(getattr(part, "content", None), str)
@@ -0,0 +1,199 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable
+
+
+def _import(module: str, package: str):
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError:
+        raise ImportError(
+            f"{package} package not installed. Install with: pip install {package}"
+        )
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _LoopClient:
+    """Async client resolved on the running loop at every attribute access."""
+
+    def __init__(self, resolve: Callable[[], Any]):
+        self._resolve = resolve
+
+    def __getattr__(self, name: str):
+        return getattr(self._resolve(), name)
+
+
+class _GeminiClient:
+    """Gemini client whose async half, `aio`, is resolved on the running loop."""
+
+    def __init__(self, client, resolve: Callable[[], Any]):
+        self._client = client
+        self._resolve = resolve
+
+    def __getattr__(self, name: str):
+        if name == "aio":
+            return self._resolve().aio
+
+        return getattr(self._client, name)
+
+
+class ClientRegistry:
+    """Provider clients shared by selectors, reporters and adapters.
+
+    Clients are keyed by provider, base url, api key and sync/async flavor so
+    every component talking to the same endpoint reuses one connection pool.
+    Async connection pools are bound to the event loop they are used on, so
+    async clients are keyed by the running loop and the ones of closed loops
+    are dropped. Requested outside a loop, an async client is a proxy that
+    picks the client of the loop it is used on.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.clients: dict[tuple, Any] = {}
+
+    def configure(self, **options):
+        """Change the pool options of the clients created from now on."""
+        for name, value in options.items():
+            if not hasattr(self, name) or name == "clients":
+                raise ValueError(f"Unknown client option {name}.")
+
+            setattr(self, name, value)
+
+    def openai(
+        self, api_key: str | None = None, base_url: str | None = None, aio=False
+    ):
+        return self._client("openai", base_url, api_key, aio, self._openai)
+
+    def anthropic(
+        self, api_key: str | None = None, base_url: str | None = None, aio=False
+    ):
+        return self._client("anthropic", base_url, api_key, aio, self._anthropic)
+
+    def gemini(self, api_key: str | None = None):
+        # a gemini client serves both flavors, the async one lives in client.aio.
+        if _running_loop():
+            return self._client("gemini", None, api_key, True, self._gemini)
+
+        return _GeminiClient(
+            self._client("gemini", None, api_key, False, self._gemini),
+            partial(self._client, "gemini", None, api_key, True, self._gemini, False),
+        )
+
+    async def warm_up(self, connections: int = 1):
+        """Open connections of every async client ahead of the first turn."""
+        requests = []
+
+        loop = _running_loop()
+
+        for (provider, _, _, aio, client_loop), client in self.clients.items():
+            if not aio or client_loop is not loop:
+                continue
+
+            if provider == "gemini":
+                requests += [client.aio.models.list() for _ in range(connections)]
+            else:
+                requests += [client.models.list() for _ in range(connections)]
+
+        await asyncio.gather(*requests, return_exceptions=True)
+
+    async def aclose(self):
+        """Close the async clients of the running loop, before the loop ends."""
+        loop = _running_loop()
+
+        for key in [k for k in self.clients if k[3] and k[4] is loop]:
+            client = self.clients.pop(key)
+            # the async gemini client lives in client.aio.
+            client = client.aio if key[0] == "gemini" else client
+            close = getattr(client, "aclose", None) or getattr(client, "close", None)
+
+            if close:
+                await close()
+
+    def _client(
+        self, provider: str, base_url, api_key, aio: bool, create, lazy=True
+    ):
+        loop = _running_loop() if aio else None
+
+        if aio and not loop:
+            if lazy:
+                args = provider, base_url, api_key, aio, create, False
+                return _LoopClient(partial(self._client, *args))
+
+            # not cached, its pool would bind to whichever loop uses it first.
+            return create(api_key, base_url, aio)
+
+        key = self._key(provider, base_url, api_key, aio, loop)
+
+        if key not in self.clients:
+            self.clients[key] = create(api_key, base_url, aio)
+
+        return self.clients[key]
+
+    def _key(self, provider: str, base_url, api_key, aio: bool, loop) -> tuple:
+        # the pools of closed loops can not be used anymore.
+        for key in [k for k in self.clients if k[4] and k[4].is_closed()]:
+            del self.clients[key]
+
+        return (provider, base_url, api_key, aio, loop)
+
+    def _openai(self, api_key, base_url, aio: bool):
+        openai = _import("openai", "openai")
+        client_class = openai.AsyncOpenAI if aio else openai.OpenAI
+
+        return client_class(
+            api_key=api_key, base_url=base_url, http_client=self._http_client(aio)
+        )
+
+    def _anthropic(self, api_key, base_url, aio: bool):
+        anthropic = _import("anthropic", "anthropic")
+        client_class = anthropic.AsyncAnthropic if aio else anthropic.Anthropic
+
+        return client_class(
+            api_key=api_key, base_url=base_url, http_client=self._http_client(aio)
+        )
+
+    def _gemini(self, api_key, base_url, aio: bool):
+        genai = _import("google.genai", "google-genai")
+        limits = {"limits": self._limits()}
+
+        return genai.Client(
+            api_key=api_key,
+            http_options=genai.types.HttpOptions(
+                client_args=limits, async_client_args=limits
+            ),
+        )
+
+    def _limits(self):
+        httpx = _import("httpx", "httpx")
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _http_client(self, aio: bool):
+        httpx = _import("httpx", "httpx")
+        client_class = httpx.AsyncClient if aio else httpx.Client
+
+        # same default timeout as the provider sdks.
+        timeout = httpx.Timeout(600, connect=5)
+
+        return client_class(limits=self._limits(), timeout=timeout)
+
+
+default_clients = ClientRegistry()
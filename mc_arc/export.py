@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Hashable, Iterable
+from mc_arc.interfaces import Message
+from mc_arc.limits import current_session
+
+
+class ParquetExporter:
+    """Streams committed messages to a Parquet file, one row group per batch.
+
+    Rows are buffered column-wise up to batch_size, so memory stays bounded
+    whatever the number of turns. Every row group carries min/max statistics,
+    filters on session, index or timestamp skip the row groups they exclude:
+
+        pyarrow.parquet.read_table(path, filters=[("session", "=", "room-1")])
+
+    Subscribe it to a MasterOfCeremony with `mc.subscribe(exporter)`. The
+    session is the current scheduler session unless given to `append`.
+    Row groups are written by a background thread, in order, so committing a
+    message never waits on disk. At most one row group is written while the
+    next one fills, a writer slower than the conversation makes the commit
+    that completes a batch wait for the previous write. Writer errors do not
+    reach the committing code, they are kept in `error` and raised by `flush`
+    and `close`.
+    """
+
+    def __init__(self, path: str, batch_size: int = 65_536, compression: str = "zstd"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow package not installed. Install with: pip install pyarrow"
+            )
+
+        self.pa = pa
+        self.batch_size = batch_size
+        self.schema = pa.schema(
+            [
+                pa.field("session", pa.string()),
+                pa.field("index", pa.int64(), nullable=False),
+                pa.field("name", pa.string(), nullable=False),
+                pa.field("content", pa.large_string(), nullable=False),
+                pa.field("tokens", pa.int32()),
+                pa.field("timestamp", pa.timestamp("us", tz="UTC"), nullable=False),
+                # seconds since the previous message of the same session.
+                pa.field("elapsed", pa.float64()),
+            ]
+        )
+        self.writer = pq.ParquetWriter(
+            path, self.schema, compression=compression, write_statistics=True
+        )
+        self.columns: dict[str, list] = self._empty_columns()
+        self.last_timestamps: dict[Hashable, float] = {}
+        self.rows = 0
+        self.error: Exception | None = None
+        # a single worker keeps the row groups in order.
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="parquet")
+        self.pending: Future | None = None
+
+    def __call__(self, message: Message, index: int):
+        try:
+            self.append(message, index)
+        except Exception as error:
+            self.error = error  # a failing export must not break the conversation.
+
+    def append(self, message: Message, index: int, session: Hashable = None):
+        session = current_session.get() if session is None else session
+        now = time.time()
+        previous = self.last_timestamps.get(session)
+        self.last_timestamps[session] = now
+
+        row = (
+            None if session is None else str(session),
+            index,
+            message.name,
+            message.content,
+            message.tokens,
+            int(now * 1e6),
+            None if previous is None else now - previous,
+        )
+
+        for column, value in zip(self.columns.values(), row):
+            column.append(value)
+
+        if len(self.columns["index"]) >= self.batch_size:
+            self._submit()
+
+    def extend(self, messages: Iterable[Message], start: int = 0, session=None):
+        """Exports messages already committed, from the given timeline index."""
+        for index, message in enumerate(messages, start):
+            self.append(message, index, session)
+
+    def flush(self):
+        """Writes the buffered rows and waits for every pending write."""
+        self._submit()
+
+        if self.pending:
+            self.pending.result()
+
+        self._raise()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.executor.shutdown()
+            self.writer.close()
+
+    def _empty_columns(self) -> dict[str, list]:
+        return {name: [] for name in self.schema.names}
+
+    def _submit(self):
+        if not self.columns["index"]:
+            return
+
+        # backpressure, the batches waiting for the writer stay bounded.
+        if self.pending:
+            self.pending.result()
+
+        columns, self.columns = self.columns, self._empty_columns()
+        self.pending = self.executor.submit(self._write, columns)
+
+    def _write(self, columns: dict[str, list]):
+        try:
+            batch = self.pa.RecordBatch.from_pydict(columns, schema=self.schema)
+            self.writer.write_batch(batch)
+            self.rows += batch.num_rows
+        except Exception as error:
+            self.error = error
+
+    def _raise(self):
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
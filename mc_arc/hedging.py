@@ -0,0 +1,98 @@
+import time
+import asyncio
+from collections import deque
+from typing import Any, Callable
+from mc_arc.utils import is_async_callable, maybe_await
+
+
+class Hedging:
+    """Deadline and hedged requests for a selector or reporter call.
+
+    Once the first request has not answered after the observed latency
+    quantile, or after hedge_after until enough latencies are observed, a
+    second request is sent, to the backup callable when given, and the first
+    answer wins. The whole call raises TimeoutError past the timeout so the
+    caller can fall back to a local answer.
+
+    Sync callables run in a thread so a blocking provider call does not hold
+    the event loop, a cancelled thread still runs to completion.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        hedge_after: float | None = None,
+        quantile: float | None = 0.95,
+        min_samples: int = 20,
+        window: int = 256,
+        backup: Callable | None = None,
+    ):
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.backup = backup
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.hedges = 0
+        self.backup_wins = 0
+        self.timeouts = 0
+
+    def delay(self) -> float | None:
+        if self.quantile is None or len(self.latencies) < self.min_samples:
+            return self.hedge_after
+
+        ordered = sorted(self.latencies)
+
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+
+    async def __call__(self, primary: Callable, *args) -> Any:
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await self._race(primary, args)
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+
+    async def _race(self, primary: Callable, args: tuple) -> Any:
+        start = time.monotonic()
+        first = asyncio.ensure_future(_call(primary, args))
+        tasks = [first]
+        delay = self.delay()
+
+        try:
+            while True:
+                hedging = len(tasks) == 1 and first in tasks and delay is not None
+
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=delay if hedging else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    self.hedges += 1
+                    backup = self.backup or primary
+                    tasks.append(asyncio.ensure_future(_call(backup, args)))
+                    continue
+
+                for task in done:
+                    if task.exception() is None:
+                        # a backup win bounds the primary latency from below.
+                        self.latencies.append(time.monotonic() - start)
+                        self.backup_wins += task is not first
+                        return task.result()
+
+                tasks = [task for task in tasks if not task.done()]
+
+                if not tasks:
+                    raise done.pop().exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def _call(fn: Callable, args: tuple) -> Any:
+    if is_async_callable(fn):
+        return await fn(*args)
+
+    return await maybe_await(await asyncio.to_thread(fn, *args))
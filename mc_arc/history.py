@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from mc_arc.prompts import HISTORY_SUMMARY_PROMPT_TEMPLATE
+from mc_arc.utils import maybe_await
+
+Summarizer = Callable[[str], str | Awaitable[str]]
+
+
+@dataclass
+class Turn:
+    """Provider messages from one user prompt up to the next, kept together."""
+
+    messages: list[Any]
+    text: str
+    tokens: int
+
+
+def _newest(turns: list[Turn], max_tokens: int, max_turns: int | None) -> int:
+    # index of the oldest turn kept, the last turn is always kept.
+    tokens = 0
+    start = len(turns)
+
+    while start > 0:
+        tokens += turns[start - 1].tokens
+
+        if start < len(turns) and tokens > max_tokens:
+            break
+
+        if max_turns is not None and len(turns) - start >= max_turns:
+            break
+
+        start -= 1
+
+    return start
+
+
+class HistoryPolicy(ABC):
+    """Bounds the conversation history an adapter sends with each request.
+
+    Policies return the turns to keep and an optional summary of the dropped
+    ones, which the adapter prepends to the first kept turn along with the
+    system prompt when it is pinned.
+    """
+
+    def __init__(self, pin_system_prompt: bool = True):
+        self.pin_system_prompt = pin_system_prompt
+
+    @abstractmethod
+    async def apply(self, turns: list[Turn]) -> tuple[list[Turn], str | None]:
+        pass
+
+
+class SlidingWindow(HistoryPolicy):
+    """Keeps the newest turns within max_tokens and the optional max_turns."""
+
+    def __init__(
+        self,
+        max_tokens: int,
+        max_turns: int | None = None,
+        pin_system_prompt: bool = True,
+    ):
+        super().__init__(pin_system_prompt)
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+
+    async def apply(self, turns: list[Turn]) -> tuple[list[Turn], str | None]:
+        return turns[_newest(turns, self.max_tokens, self.max_turns) :], None
+
+
+class Summarize(HistoryPolicy):
+    """Replaces the older turns by a summary once the history exceeds max_tokens.
+
+    The newest turns within keep_tokens are kept verbatim. The previous summary
+    is part of the oldest turn, so it is folded into the next one. Older turns
+    are dropped when the summarizer fails.
+    """
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        max_tokens: int,
+        keep_tokens: int | None = None,
+        pin_system_prompt: bool = True,
+    ):
+        super().__init__(pin_system_prompt)
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.keep_tokens = max_tokens // 2 if keep_tokens is None else keep_tokens
+        self.template = HISTORY_SUMMARY_PROMPT_TEMPLATE
+
+    async def apply(self, turns: list[Turn]) -> tuple[list[Turn], str | None]:
+        if sum([turn.tokens for turn in turns]) <= self.max_tokens:
+            return turns, None
+
+        start = _newest(turns, self.keep_tokens, None)
+
+        if not start:
+            return turns, None
+
+        older = "\n\n".join([turn.text for turn in turns[:start]])
+
+        try:
+            summary = await maybe_await(self.summarizer(self.template(older)))
+        except Exception:
+            summary = None
+
+        return turns[start:], summary or None
@@ -0,0 +1,94 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass(slots=True)
+class Event:
+    name: str
+    # wall clock time at which the event ended, in seconds.
+    timestamp: float
+    duration: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+Subscriber = Callable[[Event], None]
+
+
+class Instrumentation:
+    """Timed events of the turns, dispatched to pluggable subscribers.
+
+    Without subscribers `enabled` is false, call sites check it before taking
+    any timing so the instrumentation costs an attribute lookup.
+    """
+
+    def __init__(self):
+        self.subscribers: list[Subscriber] = []
+        self.enabled = False
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        self.subscribers.append(subscriber)
+        self.enabled = True
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.remove(subscriber)
+        self.enabled = bool(self.subscribers)
+
+    def start(self) -> float | None:
+        return time.perf_counter() if self.enabled else None
+
+    def emit(self, name: str, start: float | None = None, **attributes):
+        if not self.enabled:
+            return
+
+        duration = time.perf_counter() - start if start is not None else None
+        event = Event(name, time.time(), duration, attributes)
+
+        for subscriber in self.subscribers:
+            try:
+                subscriber(event)
+            except Exception:
+                pass  # a failing subscriber must not break the conversation.
+
+
+default_instrumentation = Instrumentation()
+
+
+class OpenTelemetrySubscriber:
+    """Exports events as OpenTelemetry spans, untimed events as empty spans.
+
+    Logfire configures the global tracer provider, so with `logfire.configure()`
+    the spans are sent to logfire as well.
+    """
+
+    def __init__(self, tracer=None, prefix: str = "mc_arc."):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ImportError(
+                    "opentelemetry-api package not installed. "
+                    "Install with: pip install opentelemetry-api"
+                )
+
+            tracer = trace.get_tracer("mc_arc")
+
+        self.tracer = tracer
+        self.prefix = prefix
+
+    def __call__(self, event: Event):
+        end = int(event.timestamp * 1e9)
+        start = end - int((event.duration or 0.0) * 1e9)
+
+        attributes = {
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in event.attributes.items()
+            if value is not None
+        }
+
+        span = self.tracer.start_span(
+            self.prefix + event.name, start_time=start, attributes=attributes
+        )
+        span.end(end_time=end)
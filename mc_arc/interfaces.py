@@ -1,11 +1,15 @@
-from dataclasses import dataclass
-from typing import AsyncGenerator, Callable, Union
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Awaitable, Callable, Union
 
 
 @dataclass
 class Message:
     name: str
     content: str
+    # token estimate, cached when the message is committed.
+    tokens: int | None = field(default=None, compare=False, repr=False)
+    # absolute timeline index, set when the message is committed.
+    index: int | None = field(default=None, compare=False, repr=False)
 
     def __str__(self):
         return f"{self.name}: {self.content}"
@@ -13,8 +17,12 @@ class Message:
 
 Selector = Callable[[list[str], list[Message]], str]
 
+AsyncSelector = Callable[[list[str], list[Message]], Awaitable[str]]
+
 Reporter = Callable[[str, list[Message]], str]
 
+AsyncReporter = Callable[[str, list[Message]], Awaitable[str]]
+
 # a non cumulative stream of text is expected
 AgentResponse = AsyncGenerator[str, None]
 
@@ -0,0 +1,332 @@
+import time
+import asyncio
+import contextlib
+import contextvars
+import threading
+from collections import deque
+from typing import AsyncIterator, Hashable
+
+# the session on whose behalf provider requests are made, used for fair queuing.
+current_session: contextvars.ContextVar[Hashable] = contextvars.ContextVar(
+    "current_session", default=None
+)
+# the request running in a limit block, settled with its actual usage.
+current_lease: contextvars.ContextVar["Lease | None"] = contextvars.ContextVar(
+    "current_lease", default=None
+)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def delay(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+        missing = min(amount, self.capacity) - self.level
+
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        # negative when more was used than taken.
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _StreamEnd:
+    def __init__(self, error: BaseException | None = None):
+        self.error = error
+
+
+class Lease:
+    """A granted request, its in-flight slot and the tokens it reserved.
+
+    Used as a context manager it is the current lease of its block, the one
+    settle_usage settles, and its slot is released at the end of the block.
+    """
+
+    def __init__(self, limiter: "RateLimiter | None", tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.released = False
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = current_lease.get()
+        current_lease.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # not reset with a token, generators may be closed in another context.
+        current_lease.set(self._previous)
+        self.release()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+    def release(self):
+        """Give the in-flight slot back, before the end of the limit block."""
+        if self.limiter and not self.released:
+            self.released = True
+            self.limiter.release()
+
+    def settle(self, tokens: int):
+        """Replace the estimated tokens with the ones actually used."""
+        if self.limiter:
+            self.limiter.settle(self.tokens, tokens)
+
+        self.tokens = tokens
+
+    async def stream(self, chunks: AsyncIterator) -> AsyncIterator:
+        """Yield the chunks of a provider stream, read at the provider's pace.
+
+        The slot is released as soon as the provider stream ends, a consumer
+        still going through the chunks does not hold it.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def read():
+            try:
+                async for chunk in chunks:
+                    queue.put_nowait(chunk)
+            except Exception as error:
+                queue.put_nowait(_StreamEnd(error))
+            else:
+                queue.put_nowait(_StreamEnd())
+            finally:
+                self.release()
+
+        reader = asyncio.create_task(read())
+
+        try:
+            while not isinstance(item := await queue.get(), _StreamEnd):
+                yield item
+
+            if item.error:
+                raise item.error
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+
+class RateLimiter:
+    """Limits requests per second, tokens per minute and requests in flight.
+
+    Waiting requests are queued per session and sessions are served round
+    robin, so a busy session can not starve the others. Sync callers block
+    their thread in `limit_sync` and are served as soon as there is room.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_in_flight: int | None = None,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_second, max(requests_per_second, 1))
+            if requests_per_second
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.completed = 0
+        self.consumed_tokens = 0
+        self._queues: dict[Hashable, deque[tuple[asyncio.Future, int]]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        # the loop of the async waiters, sync callers run on other threads.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, tokens: int = 0, session: Hashable = None):
+        await self.acquire(tokens, session)
+
+        with Lease(self, tokens) as lease:
+            yield lease
+
+    @contextlib.contextmanager
+    def limit_sync(self, tokens: int = 0):
+        self.acquire_sync(tokens)
+
+        with Lease(self, tokens) as lease:
+            yield lease
+
+    async def acquire(self, tokens: int = 0, session: Hashable = None):
+        if session is None:
+            session = current_session.get()
+
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+
+        self._queues.setdefault(session, deque()).append((future, tokens))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # granted right before being cancelled, give the slot back.
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def acquire_sync(self, tokens: int = 0):
+        # on a loop thread the slots are released by that very loop, waiting for
+        # them would deadlock: only the rates are waited for there.
+        slots = self.max_in_flight if _running_loop() is None else None
+
+        with self._lock:
+            while True:
+                if slots and self.in_flight >= slots:
+                    self._changed.wait()
+                elif delay := self._take(tokens):
+                    self._changed.wait(delay)
+                else:
+                    return
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+        self._wake()
+
+    def settle(self, estimated: int, tokens: int):
+        with self._lock:
+            if self.tokens:
+                self.tokens.give_back(estimated - tokens)
+
+            self.consumed_tokens += tokens - estimated
+
+        self._wake()
+
+    def _wake(self):
+        # sync waiters are notified, async ones dispatched on their loop.
+        with self._lock:
+            self._changed.notify_all()
+
+        loop = self._loop
+
+        if not loop or loop.is_closed():
+            return
+
+        if _running_loop() is loop:
+            self._dispatch()
+        else:
+            loop.call_soon_threadsafe(self._dispatch)
+
+    def _take(self, tokens: int) -> float:
+        # the delay before the request can start, it is counted in when 0.
+        now = time.monotonic()
+        buckets = [(self.requests, 1), (self.tokens, tokens)]
+        buckets = [(bucket, amount) for bucket, amount in buckets if bucket]
+        delay = max([bucket.delay(amount, now) for bucket, amount in buckets] or [0])
+
+        if delay > 0:
+            return delay
+
+        for bucket, amount in buckets:
+            bucket.take(amount)
+
+        self.in_flight += 1
+        self.consumed_tokens += tokens
+
+        return 0.0
+
+    def _dispatch(self):
+        with self._lock:
+            self._dispatch_locked()
+
+    def _dispatch_locked(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queues:
+            session, queue = next(iter(self._queues.items()))
+            future, tokens = queue[0]
+
+            if future.cancelled():
+                queue.popleft()
+
+                if not queue:
+                    del self._queues[session]
+
+                continue
+
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return  # dispatched again on release.
+
+            if delay := self._take(tokens):
+                self._timer = self._loop.call_later(delay, self._dispatch)
+                return
+
+            # move the session to the back of the round robin.
+            queue.popleft()
+            del self._queues[session]
+
+            if queue:
+                self._queues[session] = queue
+
+            future.set_result(None)
+
+
+class RateLimits:
+    """Registry of rate limiters shared by provider, optionally by model."""
+
+    def __init__(self):
+        self.limiters: dict[tuple[str, str | None], RateLimiter] = {}
+
+    def configure(self, provider: str, model: str | None = None, **options):
+        limiter = RateLimiter(**options)
+
+        self.limiters[(provider, model)] = limiter
+
+        return limiter
+
+    def get(self, provider: str, model: str | None = None) -> RateLimiter | None:
+        return self.limiters.get((provider, model)) or self.limiters.get(
+            (provider, None)
+        )
+
+    def limit(self, provider: str, model: str | None, tokens: int = 0):
+        limiter = self.get(provider, model)
+
+        return limiter.limit(tokens) if limiter else Lease(None, tokens)
+
+    def limit_sync(self, provider: str, model: str | None, tokens: int = 0):
+        """Same as limit, blocking the calling thread while it waits."""
+        limiter = self.get(provider, model)
+
+        return limiter.limit_sync(tokens) if limiter else Lease(None, tokens)
+
+
+def settle_usage(tokens: int):
+    """Settle the tokens of the request running in the current limit block."""
+    if lease := current_lease.get():
+        lease.settle(tokens)
+
+
+default_limits = RateLimits()
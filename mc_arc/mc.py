@@ -1,59 +1,333 @@
 import random
+import asyncio
 import contextlib
+import warnings
+from typing import Callable
+from mc_arc.hedging import Hedging
+from mc_arc.instrumentation import Instrumentation, default_instrumentation
+from mc_arc.limits import current_session
 from mc_arc.participant import Participant
-from mc_arc.interfaces import Selector, Message
+from mc_arc.prompts import INTERRUPTED_TEMPLATE
+from mc_arc.response import Coalescing, StreamingResponse
+from mc_arc.speculation import Arbiter, DraftRun
+from mc_arc.interfaces import Selector, AsyncSelector, Message
+from mc_arc.timeline import Timeline
+from mc_arc.tokens import TokenEstimator, estimate_tokens
+from mc_arc.usage import (
+    BudgetExceeded,
+    UsageTracker,
+    current_participant,
+    default_usage,
+)
+from mc_arc.utils import maybe_await
+
+
+async def _no_chunks():
+    return
+    yield
 
 
 class MasterOfCeremony:
     def __init__(
         self,
-        selector: Selector | None = None,
+        selector: Selector | AsyncSelector | None = None,
         participants: list[Participant] | None = None,
+        pipelined: bool = False,
+        reclaim: bool = False,
+        timeline: Timeline | None = None,
+        token_estimator: TokenEstimator = estimate_tokens,
+        speculative: int = 0,
+        arbiter: Arbiter | None = None,
+        instrumentation: Instrumentation | None = None,
+        usage: UsageTracker | None = None,
+        selector_hedging: Hedging | None = None,
     ):
         self.selector = selector
+        self.pipelined = pipelined
+        self.token_estimator = token_estimator
+        self.speculative = speculative
+        self.arbiter = arbiter
+        self.instrumentation = instrumentation or default_instrumentation
+        self.usage = usage or default_usage
+        self.selector_hedging = selector_hedging
+        self.last_spoken: dict[str, int] = {}
         self.participants: dict[str, Participant] = {}
-        self.last_name: str | None = None
-        self.timeline: list[Message] = []
-        self.offsets: dict[str, int] = {}
+        self.timeline = timeline if timeline is not None else Timeline(reclaim)
+        self.last_name: str | None = self.timeline[-1].name if self.timeline else None
+
+        # messages replayed from a persistent timeline have no estimate yet.
+        for message in self.timeline:
+            if message.tokens is None:
+                message.tokens = self.token_estimator(str(message))
+        self._listeners: list[Participant] = []
+        self._subscribers: list[Callable[[Message, int], None]] = []
+        self._prefetch: asyncio.Task[Participant] | None = None
+        # the reply being streamed by step, and its speaker.
+        self._active: tuple[str, StreamingResponse] | None = None
+        # the step task while it selects and prepares the reply.
+        self._starting: asyncio.Task | None = None
+        self._aborted = False
 
         for participant in participants or []:
             self.add_participant(participant)
 
+    @property
+    def offsets(self) -> dict[str, int]:
+        """Deprecated, the position of each participant cursor in `timeline`.
+
+        Positions are relative to the messages still held, as indexes into
+        `mc.timeline`. This is a snapshot, changing it does not move cursors:
+        use `timeline.cursors` (absolute indexes) and `timeline.advance`.
+        """
+        warnings.warn(
+            "MasterOfCeremony.offsets is deprecated, use timeline.cursors.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        start = self.timeline.start
+
+        cursors = self.timeline.cursors
+
+        return {name: max(cursor - start, 0) for name, cursor in cursors.items()}
+
     def add_participant(self, participant: Participant):
         if self.participants.get(participant.name):
             raise ValueError(f"Participant named {participant.name} already exists.")
 
+        self._cancel_prefetch()
+
         self.participants[participant.name] = participant
 
-    def add_message(self, sender: str, content: str):
+        participant.join(self.timeline)
+
+        if participant.incremental:
+            self._listeners.append(participant)
+
+    def add_message(self, sender: str, content: str, interrupt: bool = False):
+        # a barge in commits the interrupted reply first, in speaking order.
+        if interrupt:
+            self.interrupt()
+
         message = Message(sender, content)
+        message.tokens = self.token_estimator(str(message))
+
+        # any new message changes the timeline the prefetched choice was based on.
+        self._cancel_prefetch()
 
-        self.timeline.append(message)
+        message.index = self.timeline.append(message)
+        self.last_spoken[sender] = message.index
         self.last_name = sender
 
-        for participant in self.participants.values():
+        # buffers are views of the timeline, only incremental participants
+        # need to be told about new messages.
+        for participant in self._listeners:
             participant.receive_message(message)
 
-    def pull_timeline_as(self, subscriber: str) -> list[Message]:
-        start = self.offsets.get(subscriber, 0)
+        for subscriber in self._subscribers:
+            subscriber(message, message.index)
+
+    def interrupt(
+        self, template: Callable[[str], str] = INTERRUPTED_TEMPLATE
+    ) -> bool:
+        """Interrupts the reply being streamed by step, if any.
+
+        The text streamed so far is committed at once through the template,
+        the provider stream is closed as soon as the consumer waits on it, see
+        StreamingResponse.interrupt. A step still selecting or reporting is
+        aborted and streams nothing. Returns whether a step was interrupted.
+        """
+        if self._active is None:
+            if self._starting is None:
+                return False
+
+            self._aborted = True
+            self._starting.cancel()
+            self.instrumentation.emit("interrupt", participant=None, chars=0)
+
+            return True
+
+        name, response = self._active
+        self._active = None
+        response.interrupt()
+
+        content = response.get_full_response()
 
-        timeline = self.timeline[start:]
+        if content:
+            self.add_message(name, template(content))
 
-        self.offsets[subscriber] = len(self.timeline)
+        self.instrumentation.emit("interrupt", participant=name, chars=len(content))
 
-        return timeline
+        return True
+
+    def subscribe(
+        self, subscriber: Callable[[Message, int], None], replay: bool = False
+    ):
+        """Calls subscriber with every committed message and its timeline index.
+
+        With replay, the messages already in the timeline are passed first, to
+        fill an index or an export after resuming a persistent timeline.
+        """
+        if replay:
+            for index, message in enumerate(self.timeline, self.timeline.start):
+                subscriber(message, index)
+
+        self._subscribers.append(subscriber)
+
+    def add_reader(self, reader: str):
+        """Registers a reader of pull_timeline_as, reclaim waits for its pulls."""
+        self.timeline.add_reader(reader)
+
+    def pull_timeline_as(self, reader: str) -> list[Message]:
+        """The messages committed since the previous pull of reader.
+
+        Readers are apart from the participants, pulling never consumes a
+        participant buffer.
+        """
+        return self.timeline.pull(reader)
 
     @contextlib.asynccontextmanager
-    async def step(self, cumulative: bool = False):
-        participant = self._select_available_participant()
+    async def step(
+        self, cumulative: bool = False, coalescing: Coalescing | None = None
+    ):
+        start = self.instrumentation.start()
+
+        self._check_budgets()
 
-        response = participant.reply(cumulative)
+        task = self._starting = asyncio.current_task()
+        name, response = None, None
+
+        try:
+            if self.speculative > 1:
+                name, response = await self._speculate(cumulative, coalescing)
+            else:
+                participant = await self._next_participant()
+                name = participant.name
+                response = await participant.reply(cumulative, coalescing)
+        except asyncio.CancelledError:
+            if not self._aborted:
+                raise
+
+            # the cancellation came from interrupt, the step just ends.
+            task.uncancel()
+        finally:
+            self._starting = None
+            self._aborted = False
+
+        if response is None:
+            yield _no_chunks()
+            return
+
+        # the speaker usage is recorded while the stream is consumed.
+        token = current_participant.set(name)
+        self._active = (name, response)
 
         async with response as generator:
             try:
                 yield generator
             finally:
-                self.add_message(participant.name, response.get_full_response())
+                current_participant.reset(token)
+
+                # an interrupted reply was committed by interrupt.
+                if self._active is not None:
+                    self._active = None
+                    content = response.get_full_response()
+                    self.add_message(name, content)
+                    self.instrumentation.emit(
+                        "commit", start, participant=name, chars=len(content)
+                    )
+
+                self._start_prefetch()
+
+    async def _speculate(
+        self, cumulative: bool, coalescing: Coalescing | None
+    ) -> tuple[str, StreamingResponse]:
+        # the least recent speakers generate concurrently, only one is committed.
+        candidates = sorted(
+            self._available_names(), key=lambda n: self.last_spoken.get(n, -1)
+        )[: self.speculative]
+
+        selection = None
+
+        if not self.arbiter:
+            selection = asyncio.create_task(
+                self._select_available_participant(candidates)
+            )
+
+        runs: dict[str, DraftRun] = {}
+
+        try:
+            drafts = await asyncio.gather(
+                *[self.participants[name].draft() for name in candidates],
+                return_exceptions=True,
+            )
+
+            # the drafts started are run so the cleanup below closes them.
+            for draft in drafts:
+                if not isinstance(draft, BaseException):
+                    runs[draft.name] = DraftRun(draft)
+
+            for draft in drafts:
+                if isinstance(draft, BaseException):
+                    raise draft
+
+            if selection:
+                winner = runs[(await selection).name]
+            else:
+                winner = await self._arbitrate(runs)
+        except BaseException:
+            if selection:
+                selection.cancel()
+            await asyncio.gather(*[run.cancel() for run in runs.values()])
+            raise
+
+        await asyncio.gather(
+            *[run.cancel() for run in runs.values() if run is not winner]
+        )
+
+        winner.draft.commit()
+
+        return winner.name, StreamingResponse(
+            winner.name,
+            winner.stream(),
+            cumulative,
+            coalescing,
+            self.instrumentation,
+        )
+
+    async def _arbitrate(self, runs: dict[str, DraftRun]) -> DraftRun:
+        await asyncio.gather(
+            *[run.text() for run in runs.values()], return_exceptions=True
+        )
+
+        replies = {
+            name: "".join(run.chunks).strip()
+            for name, run in runs.items()
+            if not run.error
+        }
+
+        if not replies:
+            raise next(iter(runs.values())).error
+
+        name = await maybe_await(self.arbiter(replies, self.timeline))
+
+        return runs[name if name in replies else random.choice(list(replies))]
+
+    async def _next_participant(self) -> Participant:
+        prefetch, self._prefetch = self._prefetch, None
+
+        if prefetch:
+            return await prefetch
+
+        return await self._select_available_participant()
+
+    def _start_prefetch(self):
+        if self.pipelined and self.selector and self.speculative <= 1:
+            self._prefetch = asyncio.create_task(self._select_available_participant())
+
+    def _cancel_prefetch(self):
+        if self._prefetch:
+            self._prefetch.cancel()
+            self._prefetch = None
 
     def _select_participant(self, name: str) -> Participant:
         participant = self.participants.get(name)
@@ -63,23 +337,73 @@ class MasterOfCeremony:
 
         raise ValueError(f"No participant named {name}.")
 
-    def _select_available_participant(self) -> Participant:
-        available_names = [
-            name for name in self.participants.keys() if name != self.last_name
-        ]
+    def _available_names(self) -> list[str]:
+        names = self.participants.keys()
+
+        if self.usage.budgets:
+            session = current_session.get()
+            names = [n for n in names if not self.usage.exceeded(session, n, "stop")]
+
+            # the last speaker goes on when it is the only one left in budget.
+            if names == [self.last_name]:
+                return names
+
+        return [name for name in names if name != self.last_name]
+
+    def _check_budgets(self):
+        session = current_session.get()
+        budget = self.usage.exceeded(session, action="stop")
+
+        if budget is None and self.usage.budgets and not self._available_names():
+            # every participant ran out of budget, the last speaker may not be one.
+            budgets = [
+                self.usage.exceeded(session, name, "stop")
+                for name in self.participants
+            ]
+            budget = next(filter(None, budgets), None)
 
+        if budget:
+            raise BudgetExceeded(budget, session)
+
+    async def _select_available_participant(
+        self, available_names: list[str] | None = None
+    ) -> Participant:
+        if available_names is None:
+            available_names = self._available_names()
+
+        start = self.instrumentation.start()
+        self.instrumentation.emit("selection.start", candidates=len(available_names))
+
+        name = await self._select_name(available_names)
+        fallback = name is None
+
+        if fallback:
+            participant = self._select_fallback(available_names)
+        else:
+            participant = self.participants[name]
+
+        self.instrumentation.emit(
+            "selection.end", start, participant=participant.name, fallback=fallback
+        )
+
+        return participant
+
+    async def _select_name(self, available_names: list[str]) -> str | None:
         if not self.selector:
-            return self._select_fallback(available_names)
+            return None
 
         try:
-            name = self.selector(available_names, self.timeline)
-
-            if name in available_names:
-                return self.participants[name]
+            if self.selector_hedging:
+                name = await self.selector_hedging(
+                    self.selector, available_names, self.timeline
+                )
             else:
-                return self._select_fallback(available_names)
-        except Exception:
-            return self._select_fallback(available_names)
+                name = await maybe_await(self.selector(available_names, self.timeline))
+        except Exception as error:
+            self.instrumentation.emit("selection.error", error=type(error).__name__)
+            return None
+
+        return name if name in available_names else None
 
     def _select_fallback(self, available_names: list[str]) -> Participant:
         name = random.choice(available_names)
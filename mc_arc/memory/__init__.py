@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING
+from mc_arc.utils import lazy_exports
+from .base import Embedder, VectorMemory
+from .cache import EmbeddingCache
+from .stores import VectorStore, InMemoryStore, LanceDBStore
+
+# provider embedders are loaded on first access, with their provider sdk.
+_EXPORTS = {
+    "GeminiEmbedder": ".embedders",
+    "OpenAIEmbedder": ".embedders",
+    "HashingEmbedder": ".embedders",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .embedders import GeminiEmbedder, OpenAIEmbedder, HashingEmbedder
+
+__all__ = [
+    "Embedder",
+    "VectorMemory",
+    "EmbeddingCache",
+    "VectorStore",
+    "InMemoryStore",
+    "LanceDBStore",
+    "GeminiEmbedder",
+    "OpenAIEmbedder",
+    "HashingEmbedder",
+]
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Awaitable, Callable
+from mc_arc.utils import maybe_await
+from .cache import EmbeddingCache
+from .stores import Hit, VectorStore
+
+# embeds a batch of texts, one vector per text.
+Embedder = Callable[[list[str]], list[list[float]] | Awaitable[list[list[float]]]]
+
+
+class VectorMemory:
+    """Facts shared by every character in a world table, plus one table each.
+
+    A search embeds the query once, through the cache, and queries the world
+    table and the character table concurrently.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        embedder: Embedder,
+        world_table: str = "world",
+        batch_size: int = 100,
+        limit: int = 5,
+        cache: EmbeddingCache | None = None,
+    ):
+        self.store = store
+        self.embedder = embedder
+        self.world_table = world_table
+        self.batch_size = batch_size
+        self.limit = limit
+        self.cache = cache if cache is not None else EmbeddingCache()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = []
+
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i : i + self.batch_size]
+            vectors.extend(await maybe_await(self.embedder(batch)))
+
+        return vectors
+
+    async def ingest(self, table: str, facts: list[str], overwrite: bool = False):
+        vectors = await self.embed(facts)
+        rows = [{"fact": f, "vector": v} for f, v in zip(facts, vectors)]
+
+        await self.store.write(table, rows, overwrite)
+
+    async def load(self, world: list[str], characters: dict[str, list[str]]):
+        """Replaces the world facts and the facts of each character."""
+        await asyncio.gather(
+            self.ingest(self.world_table, world, overwrite=True),
+            *[
+                self.ingest(name, facts, overwrite=True)
+                for name, facts in characters.items()
+            ],
+        )
+
+    async def search(
+        self, character: str, query: str, limit: int | None = None
+    ) -> list[Hit]:
+        limit = limit or self.limit
+        vector = await self._query_vector(query)
+
+        world, own = await asyncio.gather(
+            self.store.search(self.world_table, vector, limit),
+            self.store.search(character, vector, limit),
+        )
+
+        return sorted(world + own, key=lambda hit: hit[1])[:limit]
+
+    def tool(self, character: str):
+        """An async tool reading the memory of a character, for pydantic ai agents."""
+
+        async def read_memory(query: str) -> str:
+            """
+            Query your internal memory and return the matching pieces of knowledge
+
+            Args:
+                query (str): The query to run against your internal memory.
+
+            Returns:
+                str: A bullet point list of the matching pieces of knowledge.
+            """
+            hits = await self.search(character, query)
+
+            return "\n".join([f"- {fact}" for fact, _ in hits])
+
+        return read_memory
+
+    async def _query_vector(self, query: str) -> list[float]:
+        vector = self.cache.get(query)
+
+        if vector is None:
+            [vector] = await maybe_await(self.embedder([query]))
+            self.cache.set(query, vector)
+
+        return vector
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+
+class EmbeddingCache:
+    """LRU cache of embeddings keyed by text."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+
+    def get(self, text: str) -> list[float] | None:
+        vector = self._entries.get(text)
+
+        if vector is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(text)
+
+        return vector
+
+    def set(self, text: str, vector: list[float]):
+        self._entries[text] = vector
+        self._entries.move_to_end(text)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, text: str):
+        return text in self._entries
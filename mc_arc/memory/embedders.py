@@ -0,0 +1,61 @@
+import hashlib
+import re
+from mc_arc.clients import ClientRegistry, default_clients
+
+
+class GeminiEmbedder:
+    def __init__(
+        self,
+        model: str = "text-embedding-004",
+        api_key: str | None = None,
+        clients: ClientRegistry | None = None,
+    ):
+        self.model = model
+        self.client = (clients or default_clients).gemini(api_key)
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        response = await self.client.aio.models.embed_content(
+            model=self.model, contents=texts
+        )
+
+        return [embedding.values for embedding in response.embeddings]
+
+
+class OpenAIEmbedder:
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        api_key: str | None = None,
+        base_url: str | None = None,
+        clients: ClientRegistry | None = None,
+    ):
+        self.model = model
+        self.client = (clients or default_clients).openai(api_key, base_url, aio=True)
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        response = await self.client.embeddings.create(model=self.model, input=texts)
+
+        return [item.embedding for item in response.data]
+
+
+class HashingEmbedder:
+    """Local bag of words embedder, words are hashed into dimensions.
+
+    No model and no network: texts sharing words are close. Meant for tests
+    and offline runs, not for semantic search.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            vector[int.from_bytes(digest) % self.dimensions] += 1.0
+
+        return vector
@@ -0,0 +1,91 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Any
+
+# a search hit, the fact and its distance to the query.
+Hit = tuple[str, float]
+
+
+class VectorStore(ABC):
+    """Tables of facts and their vectors."""
+
+    @abstractmethod
+    async def write(self, table: str, rows: list[dict], overwrite: bool = False):
+        pass
+
+    @abstractmethod
+    async def search(self, table: str, vector: list[float], limit: int) -> list[Hit]:
+        pass
+
+
+class InMemoryStore(VectorStore):
+    """Brute force cosine distance, for tests and small memories."""
+
+    def __init__(self):
+        self.tables: dict[str, list[tuple[str, list[float], float]]] = {}
+
+    async def write(self, table: str, rows: list[dict], overwrite: bool = False):
+        entries = [] if overwrite else self.tables.get(table, [])
+        entries.extend([(r["fact"], r["vector"], _norm(r["vector"])) for r in rows])
+        self.tables[table] = entries
+
+    async def search(self, table: str, vector: list[float], limit: int) -> list[Hit]:
+        norm = _norm(vector)
+        hits = [
+            (fact, 1 - sum([a * b for a, b in zip(vector, v)]) / (norm * n or 1.0))
+            for fact, v, n in self.tables.get(table, [])
+        ]
+
+        return sorted(hits, key=lambda hit: hit[1])[:limit]
+
+
+def _norm(vector: list[float]) -> float:
+    return math.sqrt(sum([x * x for x in vector]))
+
+
+class LanceDBStore(VectorStore):
+    """LanceDB tables through the async api, table handles are opened once."""
+
+    def __init__(self, uri: str, **options):
+        self.uri = uri
+        self.options = options
+        self.db: Any = None
+        self.tables: dict[str, Any] = {}
+
+    async def connect(self):
+        if self.db is None:
+            try:
+                import lancedb
+            except ImportError:
+                raise ImportError(
+                    "lancedb package not installed. Install with: pip install lancedb"
+                )
+
+            self.db = await lancedb.connect_async(self.uri, **self.options)
+
+        return self.db
+
+    async def table(self, name: str):
+        table = self.tables.get(name)
+
+        if table is None:
+            db = await self.connect()
+            table = self.tables[name] = await db.open_table(name)
+
+        return table
+
+    async def write(self, table: str, rows: list[dict], overwrite: bool = False):
+        db = await self.connect()
+
+        if overwrite or table not in await db.table_names():
+            self.tables[table] = await db.create_table(
+                table, data=rows, mode="overwrite"
+            )
+        else:
+            await (await self.table(table)).add(rows)
+
+    async def search(self, table: str, vector: list[float], limit: int) -> list[Hit]:
+        query = (await self.table(table)).vector_search(vector).limit(limit)
+        rows = await query.to_list()
+
+        return [(row["fact"], row["_distance"]) for row in rows]
@@ -1,41 +1,265 @@
-from mc_arc.response import StreamingResponse
-from mc_arc.interfaces import Message, Reporter, AgentAdapter
+import asyncio
+import contextlib
+from mc_arc.hedging import Hedging
+from mc_arc.limits import current_session
+from mc_arc.instrumentation import Instrumentation, default_instrumentation
+from mc_arc.response import StreamingResponse, Coalescing
+from mc_arc.interfaces import Message, Reporter, AsyncReporter, AgentAdapter
 from mc_arc.prompts import PARTICIPANT_PROMPT_TEMPLATE
+from mc_arc.speculation import Draft
+from mc_arc.timeline import Timeline
+from mc_arc.usage import UsageTracker, current_participant, default_usage
+from mc_arc.utils import maybe_await
 
 
 class Participant:
     def __init__(
-        self, name: str, agent: AgentAdapter, reporter: Reporter | None = None
+        self,
+        name: str,
+        agent: AgentAdapter,
+        reporter: Reporter | AsyncReporter | None = None,
+        incremental: bool = False,
+        instrumentation: Instrumentation | None = None,
+        usage: UsageTracker | None = None,
+        reporter_hedging: Hedging | None = None,
     ):
         self.name = name
         self.agent = agent
         self.reporter = reporter
-        self.message_buffer: list[Message] = []
+        self.incremental = incremental
+        self.instrumentation = instrumentation or default_instrumentation
+        self.usage = usage or default_usage
+        self.reporter_hedging = reporter_hedging
+        self.timeline: Timeline | None = None
+        self.briefing = ""
+        self._buffer: list[Message] = []
+        self._briefed = 0
+        self._briefing_task: asyncio.Task | None = None
+        # buffer length a reply is briefed up to, while it waits for the briefing.
+        self._briefing_limit: int | None = None
+
+    @property
+    def message_buffer(self) -> list[Message]:
+        """The messages from others since the participant's cursor.
+
+        Once joined to a timeline this is a new list on every access, changing
+        it does not change the buffer: the buffer is emptied by advancing the
+        cursor, `timeline.advance(participant.name)`.
+        """
+        if self.timeline is None:
+            return self._buffer
+
+        return self.timeline.since(self.name, exclude=self.name)
+
+    def join(self, timeline: Timeline):
+        # the buffer becomes a view of the shared timeline from now on.
+        self.timeline = timeline
+        self.timeline.subscribe(self.name)
+        self._buffer = []
 
     def receive_message(self, message: Message):
         if not self.name == message.name:
-            self.message_buffer.append(message)
+            if self.timeline is None:
+                self._buffer.append(message)
 
-    def reply(self, cumulative: bool = False) -> StreamingResponse:
-        prompt = self._prompt(self.message_buffer)
+            if self.incremental and self.reporter:
+                if self._budget_reporter() is self.reporter:
+                    self._schedule_briefing()
+
+    async def reply(
+        self, cumulative: bool = False, coalescing: Coalescing | None = None
+    ) -> StreamingResponse:
+        end = self._buffer_end()
+        prompt = await self._prompt(self.message_buffer)
 
         response = self.agent(prompt)
 
-        self.message_buffer.clear()
+        self._clear_buffer(end)
+
+        return StreamingResponse(
+            self.name, response, cumulative, coalescing, self.instrumentation
+        )
+
+    async def draft(self) -> Draft:
+        """Start a reply that only clears the buffer once committed."""
+        end = self._buffer_end()
+        prompt = await self._prompt(self.message_buffer)
+
+        draft = getattr(self.agent, "draft", None)
+
+        # adapters without draft support advance their own history anyway.
+        response, accept = draft(prompt) if draft else (self.agent(prompt), None)
+
+        def commit():
+            if accept:
+                accept()
+
+            self._clear_buffer(end)
+
+        return Draft(self.name, response, commit)
+
+    def _buffer_end(self) -> int:
+        # where the buffer is read, messages committed meanwhile stay in it.
+        return len(self._buffer) if self.timeline is None else self.timeline.end
+
+    def _clear_buffer(self, end: int):
+        # a briefing still running covers consumed messages, it must not land.
+        if self._briefing_task:
+            self._briefing_task.cancel()
+            self._briefing_task = None
 
-        return StreamingResponse(self.name, response, cumulative)
+        if self.timeline is None:
+            del self._buffer[:end]
+        else:
+            self.timeline.advance(self.name, end)
 
-    def _prompt(self, messages) -> str:
+        self.briefing = ""
+        self._briefed = 0
+
+    async def _prompt(self, messages) -> str:
         if not messages:
             return "You are the first to speak"
 
-        report = (
-            self.reporter(self.name, messages)
-            if self.reporter
-            else self._fallback_reporter(messages)
-        )
+        report = await self._report(messages)
 
         return PARTICIPANT_PROMPT_TEMPLATE(report)
 
+    async def _report(self, messages: list[Message]) -> str:
+        start = self.instrumentation.start()
+        token = current_participant.set(self.name)
+
+        try:
+            report = await self._build_report(messages)
+        finally:
+            current_participant.reset(token)
+
+        self.instrumentation.emit(
+            "report",
+            start,
+            participant=self.name,
+            messages=len(messages),
+            incremental=self.incremental,
+        )
+
+        return report
+
+    async def _build_report(self, messages: list[Message]) -> str:
+        reporter = self._budget_reporter()
+
+        if not reporter:
+            return self._fallback_reporter(messages)
+
+        incremental = self.incremental and reporter is self.reporter
+
+        if self.reporter_hedging:
+            return await self._hedged_report(reporter, messages, incremental)
+
+        if incremental:
+            return await self._wait_briefing(len(messages))
+
+        return await maybe_await(reporter(self.name, messages))
+
+    async def _hedged_report(
+        self,
+        reporter: Reporter | AsyncReporter,
+        messages: list[Message],
+        incremental: bool,
+    ) -> str:
+        hedging = self.reporter_hedging
+
+        try:
+            if incremental:
+                # briefings extend the previous one, only the deadline applies.
+                async with asyncio.timeout(hedging.timeout):
+                    return await self._wait_briefing(len(messages))
+
+            return await hedging(reporter, self.name, messages)
+        except Exception:
+            # a missed deadline or a failure degrades to the plain messages.
+            if not incremental:
+                return self._fallback_reporter(messages)
+
+            rest = self._fallback_reporter(messages[self._briefed :])
+
+            return "\n".join([r for r in [self.briefing, rest] if r])
+
+    def _budget_reporter(self) -> Reporter | AsyncReporter | None:
+        # reports are skipped or downgraded once a budget is exceeded.
+        session = current_session.get()
+
+        if self.usage.exceeded(session, self.name, "skip"):
+            return None
+
+        budget = self.usage.exceeded(session, self.name, "downgrade")
+
+        return budget.reporter if budget else self.reporter
+
     def _fallback_reporter(self, messages: list[Message]):
         return "\n".join([f"- {message}" for message in messages])
+
+    def _schedule_briefing(self):
+        if self._briefing_task and not self._briefing_task.done():
+            return
+
+        # a reply is completing the briefing inline, later messages wait for it.
+        if self._briefing_limit is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no event loop yet, the briefing is completed on reply.
+
+        self._briefing_task = loop.create_task(self._update_briefing())
+
+    async def _wait_briefing(self, count: int) -> str:
+        # the background update stops at the messages the reply is built from.
+        self._briefing_limit = count
+
+        try:
+            task, self._briefing_task = self._briefing_task, None
+
+            # a failed or cancelled update is retried below, on the critical path.
+            if task and not task.cancelled():
+                with contextlib.suppress(Exception):
+                    await task
+
+            await self._update_briefing()
+        finally:
+            self._briefing_limit = None
+
+        return self.briefing
+
+    async def _update_briefing(self):
+        token = current_participant.set(self.name)
+
+        try:
+            while self._briefed < (end := self._briefing_end()):
+                buffer = self.message_buffer
+
+                self.briefing = await self._extend_briefing(
+                    buffer[self._briefed : end]
+                )
+
+                self._briefed = end
+        finally:
+            current_participant.reset(token)
+
+    def _briefing_end(self) -> int:
+        length = len(self.message_buffer)
+
+        if self._briefing_limit is None:
+            return length
+
+        return min(length, self._briefing_limit)
+
+    async def _extend_briefing(self, messages: list[Message]) -> str:
+        extend = getattr(self.reporter, "extend", None)
+
+        if extend:
+            return await maybe_await(extend(self.name, self.briefing, messages))
+
+        # plain reporter callables can not merge, new reports are appended instead.
+        report = await maybe_await(self.reporter(self.name, messages))
+
+        return "\n".join([r for r in [self.briefing, report] if r])
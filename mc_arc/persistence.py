@@ -0,0 +1,297 @@
+import bisect
+import itertools
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from mc_arc.interfaces import Message
+from mc_arc.timeline import Timeline
+
+# each segment index entry is the byte position of a record in its log file.
+INDEX_ENTRY = struct.Struct("<Q")
+
+
+class TimelineLog:
+    """Append-only segmented log of messages stored in a local directory.
+
+    Segments are named after the offset of their first message. Every segment
+    has a `.log` file of json lines and an `.idx` file of record positions,
+    memory-mapped on replay to start reading at any offset.
+
+    Appends only write to the page cache. A background thread fsyncs the log
+    after `fsync_every` appends or every `fsync_interval` seconds, and writes
+    the saved cursors right after, so they never point past synced messages.
+    Flusher errors are kept in `error` and raised by the next append or close.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        segment_size: int = 100_000,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segments = sorted([int(p.stem) for p in self.path.glob("*.log")]) or [0]
+        self.end = 0
+        self.error: Exception | None = None
+        self._unsynced = 0
+        self._cursors: tuple[dict[str, int], dict[str, int]] | None = None
+        self._retired = []
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._recover()
+        self._open_segment()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="timeline-log", daemon=True
+        )
+        self._flusher.start()
+
+    @property
+    def first(self) -> int:
+        return self.segments[0]
+
+    def append(self, message: Message):
+        self._raise()
+        record = json.dumps({"name": message.name, "content": message.content})
+        data = record.encode() + b"\n"
+
+        with self._lock:
+            if self.end - self.segments[-1] >= self.segment_size:
+                self._roll()
+
+            self._log.write(data)
+            self._index.write(INDEX_ENTRY.pack(self._position))
+            self._position += len(data)
+            self.end += 1
+            self._unsynced += 1
+
+        if self._unsynced >= self.fsync_every:
+            self._wake.set()
+
+    def read(self, start: int) -> list[Message]:
+        with self._lock:
+            self._log.flush()
+            self._index.flush()
+
+        start = max(start, self.first)
+        messages = []
+
+        for first in self.segments[bisect.bisect_right(self.segments, start) - 1 :]:
+            log_path, index_path = self._files(first)
+            count = index_path.stat().st_size // INDEX_ENTRY.size
+            skip = max(start - first, 0)
+
+            if skip >= count:
+                continue
+
+            with open(index_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+                    (position,) = INDEX_ENTRY.unpack_from(
+                        index, skip * INDEX_ENTRY.size
+                    )
+
+            with open(log_path, "rb") as log:
+                log.seek(position)
+
+                for line in itertools.islice(log, count - skip):
+                    record = json.loads(line)
+                    messages.append(Message(record["name"], record["content"]))
+
+        return messages
+
+    def load_cursors(self) -> tuple[dict[str, int], dict[str, int]]:
+        """The participant cursors and the reader cursors."""
+        try:
+            with open(self.path / "cursors.json") as f:
+                cursors = json.load(f)
+        except FileNotFoundError:
+            return {}, {}
+
+        # older logs only hold the participant cursors.
+        if "participants" not in cursors:
+            return cursors, {}
+
+        return cursors["participants"], cursors["readers"]
+
+    def save_cursors(self, cursors: dict[str, int], readers: dict[str, int]):
+        """Queue the cursors, written to disk by the next sync."""
+        with self._lock:
+            self._cursors = dict(cursors), dict(readers)
+
+    def sync(self):
+        with self._sync_lock:
+            with self._lock:
+                files, self._retired = self._retired, []
+
+                for f in (self._log, self._index):
+                    f.flush()
+                    # a duplicate stays valid if the segment rolls meanwhile.
+                    files.append(os.fdopen(os.dup(f.fileno()), "rb"))
+
+                cursors, self._cursors = self._cursors, None
+                self._unsynced = 0
+
+            for f in files:
+                with f:
+                    os.fsync(f.fileno())
+
+            if cursors:
+                self._write_cursors(*cursors)
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        self.sync()
+        self._log.close()
+        self._index.close()
+        self._raise()
+
+    def _write_cursors(self, cursors: dict[str, int], readers: dict[str, int]):
+        tmp = self.path / "cursors.json.tmp"
+
+        with open(tmp, "w") as f:
+            json.dump({"participants": cursors, "readers": readers}, f)
+
+        os.replace(tmp, self.path / "cursors.json")
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+
+            if self._unsynced or self._cursors or self._retired:
+                try:
+                    self.sync()
+                except Exception as error:
+                    self.error = error
+
+    def _raise(self):
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+
+    def _files(self, first: int) -> tuple[Path, Path]:
+        return self.path / f"{first:020d}.log", self.path / f"{first:020d}.idx"
+
+    def _open_segment(self):
+        log_path, index_path = self._files(self.segments[-1])
+
+        self._log = open(log_path, "ab")
+        self._index = open(index_path, "ab")
+        self._position = log_path.stat().st_size
+
+    def _roll(self):
+        # the flusher fsyncs and closes the finished segment.
+        for f in (self._log, self._index):
+            f.flush()
+            self._retired.append(f)
+
+        self.segments.append(self.end)
+        self._open_segment()
+
+    def _recover(self):
+        # drop a torn record left at the end of the last segment by a crash.
+        first = self.segments[-1]
+        log_path, index_path = self._files(first)
+        log_path.touch()
+        index_path.touch()
+
+        count = index_path.stat().st_size // INDEX_ENTRY.size
+        size = 0
+
+        with open(log_path, "rb") as log, open(index_path, "rb") as index:
+            while count:
+                index.seek((count - 1) * INDEX_ENTRY.size)
+                (position,) = INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))
+                log.seek(position)
+                line = log.readline()
+
+                if line.endswith(b"\n"):
+                    size = position + len(line)
+                    break
+
+                count -= 1
+
+        os.truncate(index_path, count * INDEX_ENTRY.size)
+        os.truncate(log_path, size)
+
+        self.end = first + count
+
+
+class PersistentTimeline(Timeline):
+    """Timeline written through to a TimelineLog, resumable after a restart.
+
+    Cursors are restored from the log directory. Only the messages after
+    `start` are loaded, by default the lowest cursor when reclaim is enabled
+    and the whole log otherwise.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        reclaim: bool = False,
+        start: int | None = None,
+        **log_options,
+    ):
+        super().__init__(reclaim)
+        self.log = TimelineLog(path, **log_options)
+        cursors, readers = self.log.load_cursors()
+        self.cursors.update(cursors)
+        self.readers.update(readers)
+
+        if start is None:
+            lowest = min([*self.cursors.values(), *self.readers.values()], default=0)
+            start = lowest if reclaim else 0
+
+        self.start = min(max(start, self.log.first), self.log.end)
+        self.messages = self.log.read(self.start)
+
+        for index, message in enumerate(self.messages, self.start):
+            message.index = index
+
+    def append(self, message: Message) -> int:
+        self.log.append(message)
+
+        return super().append(message)
+
+    def subscribe(self, subscriber: str):
+        if subscriber not in self.cursors:
+            super().subscribe(subscriber)
+            self.save_cursors()
+
+    def advance(self, subscriber: str, end: int | None = None):
+        super().advance(subscriber, end)
+
+        self.save_cursors()
+
+    def add_reader(self, reader: str, start: int | None = None):
+        if reader not in self.readers:
+            super().add_reader(reader, start)
+            self.save_cursors()
+
+    def pull(self, reader: str) -> list[Message]:
+        messages = super().pull(reader)
+
+        self.save_cursors()
+
+        return messages
+
+    def save_cursors(self):
+        self.log.save_cursors(self.cursors, self.readers)
+
+    def sync(self):
+        self.log.sync()
+
+    def close(self):
+        self.save_cursors()
+        self.log.close()
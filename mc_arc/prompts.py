@@ -58,3 +58,139 @@ Keep the style simple and neutral, as if you are a helpful assistant catching th
 Messages to report:
 {messages_str}
 """.strip()
+
+
+# incremental reporter
+def REPORTER_INCREMENTAL_PROMPT_TEMPLATE(
+    name: str, briefing: str, messages: list[Message]
+):
+    messages_str = "\n".join([f"- {m}" for m in messages])
+
+    return f"""
+You are a conversation reporter assigned to assist the participant named **{name}**.
+
+You already wrote a briefing for {name} about the conversation since {name} last spoke. New messages have been posted since then.
+
+Your job is to update the briefing so it also covers the new messages.
+
+- Keep everything the current briefing says, merge the new messages at the end.
+- Write directly to {name}, using “you” when appropriate.
+- Preserve the meaning and intent of each message, but rephrase in plain language.
+- Keep all names except {name}, which should become “you”.
+- Do not copy, quote, or imitate dialogue formatting (e.g., "Name: ...").
+- Your report should be roughly one sentence per message unless merging is natural.
+- Do not invent or assume information that wasn't stated.
+- Do not add intro or final note, output the updated briefing only.
+
+Keep the style simple and neutral, as if you are a helpful assistant catching them up.
+
+Current briefing:
+{briefing}
+
+New messages to report:
+{messages_str}
+""".strip()
+
+
+# hierarchical reporter
+def REPORTER_MERGE_PROMPT_TEMPLATE(name: str, briefings: list[str]):
+    briefings_str = "\n\n".join(briefings)
+
+    return f"""
+You are a conversation reporter assigned to assist the participant named **{name}**.
+
+The following briefings each cover a consecutive part of the conversation that occurred **since {name} last spoke**, in chronological order.
+
+Your job is to merge them into a single short, natural-language briefing.
+
+- Write directly to {name}, using “you” when appropriate.
+- Keep the chronological order and every important fact, drop repetitions.
+- Be more concise than the briefings combined, favor what is still relevant.
+- Do not invent or assume information that wasn't stated.
+- Do not add intro or final note, output the merged briefing only.
+
+Briefings to merge:
+{briefings_str}
+""".strip()
+
+
+# neutral reporter
+def REPORTER_NEUTRAL_PROMPT_TEMPLATE(messages: list[Message]):
+    messages_str = "\n".join([f"- {m}" for m in messages])
+
+    return f"""
+You are a conversation reporter. The following conversation is a dialogue between participants that occurred while the reader was away.
+
+Your job is to write a short, natural-language briefing that helps the reader understand what was said.
+
+- Write in the third person, the briefing will be read by several participants.
+- Preserve the meaning and intent of each message, but rephrase in plain language.
+- Keep all participant names.
+- Do not copy, quote, or imitate dialogue formatting (e.g., "Name: ...").
+- Your report should be roughly one sentence per message unless merging is natural.
+- Do not invent or assume information that wasn't stated.
+- Do not add intro or final note, output the report only.
+
+Keep the style simple and neutral, as if you are a helpful assistant catching them up.
+
+Messages to report:
+{messages_str}
+""".strip()
+
+
+# batch reporter
+def REPORTER_BATCH_PROMPT_TEMPLATE(
+    sections: list[tuple[str, str | None, list[Message]]],
+):
+    sections_str = "\n\n".join(
+        [
+            f"## {report_id} (for {name or 'all participants'})\n"
+            + "\n".join([f"- {m}" for m in messages])
+            for report_id, name, messages in sections
+        ]
+    )
+
+    return f"""
+You are a conversation reporter assisting several participants at once.
+
+Each section below lists the messages that occurred **since a participant last spoke**. For every section, write a short, natural-language briefing that helps this participant understand what was said.
+
+- Write directly to the participant named in the section title, using “you” when appropriate. When a section is for all participants, write in the third person instead.
+- Preserve the meaning and intent of each message, but rephrase in plain language.
+- Keep all names except the participant's own name, which should become “you”.
+- Do not copy, quote, or imitate dialogue formatting (e.g., "Name: ...").
+- Each report should be roughly one sentence per message unless merging is natural.
+- Do not invent or assume information that wasn't stated.
+- Do not add intro or final note to the reports.
+
+Return one report per section, keyed by the section id.
+
+{sections_str}
+""".strip()
+
+
+# history
+def HISTORY_SUMMARY_PROMPT_TEMPLATE(history: str):
+    return f"""
+You are summarizing the earlier part of a conversation for one of its participants, who will go on with the conversation from this summary instead of the full history.
+
+- Keep the facts, decisions, open questions and commitments, with who said what.
+- Keep the persona, goals and tone the participant has shown so far.
+- Drop greetings, repetitions and small talk.
+- Do not invent or assume information that wasn't stated.
+- Do not add intro or final note to the summary.
+
+Conversation:
+{history}
+""".strip()
+
+
+def HISTORY_SUMMARY_TEMPLATE(summary: str):
+    return f"""
+Summary of the earlier conversation:
+{summary}
+""".strip()
+
+
+def INTERRUPTED_TEMPLATE(content: str):
+    return f"{content} [interrupted]"
@@ -1,19 +1,66 @@
-from .base import AbstractReporter
-from .gemini import GeminiReporter, create_gemini_reporter
-from .anthropic import AnthropicReporter, create_anthropic_reporter
-from .openai import (
-    OpenAIReporter,
-    create_openai_reporter,
-    create_openrouter_reporter,
-)
+from typing import TYPE_CHECKING
+from mc_arc.utils import lazy_exports
+from .base import AbstractReporter, AbstractAsyncReporter
+from .cache import ReportCache
+
+# provider reporters are loaded on first access, with their provider sdk.
+_EXPORTS = {
+    "GeminiReporter": ".gemini",
+    "AsyncGeminiReporter": ".gemini",
+    "create_gemini_reporter": ".gemini",
+    "create_async_gemini_reporter": ".gemini",
+    "AnthropicReporter": ".anthropic",
+    "AsyncAnthropicReporter": ".anthropic",
+    "create_anthropic_reporter": ".anthropic",
+    "create_async_anthropic_reporter": ".anthropic",
+    "OpenAIReporter": ".openai",
+    "AsyncOpenAIReporter": ".openai",
+    "create_openai_reporter": ".openai",
+    "create_openrouter_reporter": ".openai",
+    "create_async_openai_reporter": ".openai",
+    "create_async_openrouter_reporter": ".openai",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .gemini import (
+        GeminiReporter,
+        AsyncGeminiReporter,
+        create_gemini_reporter,
+        create_async_gemini_reporter,
+    )
+    from .anthropic import (
+        AnthropicReporter,
+        AsyncAnthropicReporter,
+        create_anthropic_reporter,
+        create_async_anthropic_reporter,
+    )
+    from .openai import (
+        OpenAIReporter,
+        AsyncOpenAIReporter,
+        create_openai_reporter,
+        create_openrouter_reporter,
+        create_async_openai_reporter,
+        create_async_openrouter_reporter,
+    )
 
 __all__ = [
     "AbstractReporter",
+    "AbstractAsyncReporter",
+    "ReportCache",
     "GeminiReporter",
     "OpenAIReporter",
     "AnthropicReporter",
+    "AsyncGeminiReporter",
+    "AsyncOpenAIReporter",
+    "AsyncAnthropicReporter",
     "create_gemini_reporter",
     "create_openai_reporter",
     "create_openrouter_reporter",
     "create_anthropic_reporter",
+    "create_async_gemini_reporter",
+    "create_async_openai_reporter",
+    "create_async_openrouter_reporter",
+    "create_async_anthropic_reporter",
 ]
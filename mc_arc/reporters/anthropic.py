@@ -1,7 +1,39 @@
-from .base import AbstractReporter
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractReporter, AbstractAsyncReporter, reports_schema
+
+
+def _reports_request(
+    reporter, prompt: str, report_ids: list[str], max_output_tokens: int
+) -> dict:
+    tool = {
+        "name": "write_reports",
+        "description": "Write one report per section",
+        "input_schema": reports_schema(report_ids),
+    }
+
+    return {
+        "model": reporter.model,
+        "max_tokens": max_output_tokens,
+        "temperature": reporter.temperature,
+        "messages": [{"role": "user", "content": prompt}],
+        "tools": [tool],
+        "tool_choice": {"type": "tool", "name": "write_reports"},
+    }
+
+
+def _parse_reports(response) -> dict[str, str]:
+    for content in response.content:
+        if content.type == "tool_use":
+            return content.input
+
+    return {}
 
 
 class AnthropicReporter(AbstractReporter):
+    provider = "anthropic"
+    structured_batches = True
+
     def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
         response = self.client.messages.create(
             model=self.model,
@@ -9,22 +41,82 @@ class AnthropicReporter(AbstractReporter):
             temperature=self.temperature,
             messages=[{"role": "user", "content": prompt}],
         )
+        self._record(Usage.from_anthropic(response))
+        return response.content[0].text
+
+    def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = self.client.messages.create(
+            **_reports_request(self, prompt, report_ids, max_output_tokens)
+        )
+        self._record(Usage.from_anthropic(response))
+        return _parse_reports(response)
+
+
+class AsyncAnthropicReporter(AbstractAsyncReporter):
+    provider = "anthropic"
+    structured_batches = True
+
+    async def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=max_output_tokens,
+            temperature=self.temperature,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        self._record(Usage.from_anthropic(response))
         return response.content[0].text
 
+    async def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = await self.client.messages.create(
+            **_reports_request(self, prompt, report_ids, max_output_tokens)
+        )
+        self._record(Usage.from_anthropic(response))
+        return _parse_reports(response)
+
 
 def create_anthropic_reporter(
     model: str = "claude-3-5-sonnet-20241022",
     api_key: str | None = None,
     temperature: float = 0.2,
     max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
 ):
     """Factory function that creates client and reporter together."""
-    try:
-        from anthropic import Anthropic
-    except ImportError:
-        raise ImportError(
-            "anthropic package not installed. Install with: pip install anthropic"
-        )
+    client = default_clients.anthropic(api_key)
+    return AnthropicReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
+
 
-    client = Anthropic(api_key=api_key)
-    return AnthropicReporter(model, client, temperature, max_messages)
+def create_async_anthropic_reporter(
+    model: str = "claude-3-5-sonnet-20241022",
+    api_key: str | None = None,
+    temperature: float = 0.2,
+    max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
+):
+    """Factory function that creates async client and reporter together."""
+    client = default_clients.anthropic(api_key, aio=True)
+    return AsyncAnthropicReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
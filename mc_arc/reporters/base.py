@@ -1,35 +1,569 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import partial
+from typing import Any, Generator
+from mc_arc.instrumentation import Instrumentation, default_instrumentation
 from mc_arc.interfaces import Message
-from mc_arc.prompts import REPORTER_PROMPT_TEMPLATE
+from mc_arc.prompts import (
+    REPORTER_PROMPT_TEMPLATE,
+    REPORTER_INCREMENTAL_PROMPT_TEMPLATE,
+    REPORTER_MERGE_PROMPT_TEMPLATE,
+    REPORTER_NEUTRAL_PROMPT_TEMPLATE,
+    REPORTER_BATCH_PROMPT_TEMPLATE,
+)
+from mc_arc.retrieval import RetrievalIndex
+from mc_arc.limits import RateLimits, default_limits, settle_usage
+from mc_arc.usage import REPORTER, Usage, UsageTracker, default_usage
+from mc_arc.tokens import estimate_tokens, message_tokens, output_budget, token_window
+from .cache import ReportCache
 
+# a report is built by a sequence of (prompt, max_output_tokens, cache key)
+# requests, the key is None for requests that are not cached.
+ReportSteps = Generator[tuple[str, int, str | None], str, str]
+
+# a batch of reports is made of (cache key, participant, messages) items.
+ReportBatch = list[tuple[str, str, list[Message]]]
+
+
+def reports_schema(report_ids: list[str]) -> dict:
+    return {
+        "type": "object",
+        "properties": {report_id: {"type": "string"} for report_id in report_ids},
+        "required": report_ids,
+    }
+
+
+def _report_ids(batch: ReportBatch) -> list[str]:
+    return [f"report_{i}" for i in range(len(batch))]
+
+
+class BaseReporter(ABC):
+    provider = ""
+    # whether _generate_reports makes all the reports of a batch in one request.
+    structured_batches = False
 
-class AbstractReporter(ABC):
     def __init__(
         self,
         model: str,
         client: Any,
         temperature: float = 0.2,
         max_messages: int = 100,
+        max_tokens: int | None = None,
+        chunk_size: int = 0,
+        neutral: bool = False,
+        cache: ReportCache | None = None,
+        max_batch_tokens: int = 8000,
+        max_output_tokens: int | None = 4096,
+        limits: RateLimits | None = None,
+        instrumentation: Instrumentation | None = None,
+        usage: UsageTracker | None = None,
+        retrieval: RetrievalIndex | None = None,
+        top_k: int = 8,
     ):
+        # merging one summary at a time would never shorten a level.
+        if chunk_size == 1:
+            raise ValueError("chunk_size must be 0 or at least 2.")
+
         self.model = model
         self.client = client
         self.temperature = temperature
         self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.chunk_size = chunk_size
+        self.neutral = neutral
+        self.cache = cache if cache is not None else ReportCache()
+        self.max_batch_tokens = max_batch_tokens
+        # the output limit of the model, budgets grow with the input otherwise.
+        self.max_output_tokens = max_output_tokens
+        self.limits = limits or default_limits
+        self.instrumentation = instrumentation or default_instrumentation
+        self.usage = usage or default_usage
+        self.retrieval = retrieval
+        self.top_k = top_k
         self.template = REPORTER_PROMPT_TEMPLATE
+        self.incremental_template = REPORTER_INCREMENTAL_PROMPT_TEMPLATE
+        self.merge_template = REPORTER_MERGE_PROMPT_TEMPLATE
+        self.neutral_template = REPORTER_NEUTRAL_PROMPT_TEMPLATE
+        self.batch_template = REPORTER_BATCH_PROMPT_TEMPLATE
+        # requests of the async reporters by cache key, while they run.
+        self._in_flight: dict[str, asyncio.Future[str]] = {}
+
+    def _window(self, participant: str, messages: list[Message]) -> list[Message]:
+        window = token_window(messages, self.max_messages, self.max_tokens)
+        older = messages[: len(messages) - len(window)]
+
+        if not self.retrieval or not older or older[0].index is None:
+            return window
+
+        # the older messages relevant to the participant and to the recent tail.
+        query = " ".join([participant, *[m.content for m in window[-5:]]])
+        relevant = self.retrieval.search(
+            query,
+            self.top_k,
+            older[0].index,
+            older[-1].index + 1,
+            exclude=participant,
+        )
+
+        return relevant + window
+
+    def _prompt(self, participant: str, window: list[Message]) -> tuple[str, int]:
+        # the messages are windowed by the caller, retrieval included.
+        prompt = (
+            self.neutral_template(window)
+            if self.neutral
+            else self.template(participant, window)
+        )
+
+        max_output_tokens = output_budget(
+            sum(map(message_tokens, window)), self.max_output_tokens
+        )
+
+        return prompt, max_output_tokens
+
+    def _extend_prompt(
+        self, participant: str, briefing: str, messages: list[Message]
+    ) -> tuple[str, int]:
+        last_messages = self._window(participant, messages)
+
+        prompt = self.incremental_template(participant, briefing, last_messages)
+
+        max_output_tokens = output_budget(
+            estimate_tokens(briefing) + sum(map(message_tokens, last_messages)),
+            self.max_output_tokens,
+        )
+
+        return prompt, max_output_tokens
+
+    def _merge_prompt(self, participant: str, briefings: list[str]) -> tuple[str, int]:
+        prompt = self.merge_template(participant, briefings)
+
+        max_output_tokens = output_budget(
+            sum(map(estimate_tokens, briefings)), self.max_output_tokens
+        )
+
+        return prompt, max_output_tokens
+
+    def _scope(self, participant: str) -> str:
+        # neutral reports do not depend on the participant, they are shared.
+        return "" if self.neutral else participant
+
+    def _report_steps(self, participant: str, messages: list[Message]) -> ReportSteps:
+        if self.chunk_size <= 0:
+            window = self._window(participant, messages)
+            build = partial(self._prompt, participant, window)
+            parts = [self._scope(participant), *map(str, window)]
+            return (yield from self._summary(parts, build))
+
+        # summarize every complete chunk of messages, then merge the summaries
+        # chunk_size by chunk_size until a single briefing is left.
+        size = self.chunk_size
+        chunks, tail = self._chunks(messages)
+
+        level = []
+
+        for block, chunk in chunks:
+            window = token_window(chunk, self.max_messages, self.max_tokens)
+            build = partial(self._prompt, participant, window)
+            parts = [self._scope(participant), *map(str, chunk)]
+            level.append((block, (yield from self._summary(parts, build))))
+
+        while len(level) > size:
+            # summaries are grouped on aligned blocks as well, the newest group
+            # is only merged once complete.
+            groups: dict[int, list[str]] = {}
+
+            for block, summary in level:
+                groups.setdefault(block // size, []).append(summary)
+
+            if len(groups) == 1:
+                break
+
+            *complete, newest = groups
+            upper = []
+
+            for block in complete:
+                group = groups[block]
+
+                if len(group) > 1:
+                    build = partial(self._merge_prompt, participant, group)
+                    group = [(yield from self._summary([participant, *group], build))]
+
+                upper += [(block, summary) for summary in group]
+
+            level = upper + [(newest, summary) for summary in groups[newest]]
+
+        summaries = [summary for _, summary in level]
+        briefing = summaries[0] if len(summaries) == 1 else ""
+
+        if len(summaries) > 1:
+            build = partial(self._merge_prompt, participant, summaries)
+            briefing = yield from self._summary([participant, *summaries], build)
+
+        if not tail:
+            return briefing
+
+        if not briefing:
+            window = self._window(participant, tail)
+            build = partial(self._prompt, participant, window)
+            parts = [self._scope(participant), *map(str, window)]
+            return (yield from self._summary(parts, build))
+
+        return (yield (*self._extend_prompt(participant, briefing, tail), None))
+
+    def _chunks(
+        self, messages: list[Message]
+    ) -> tuple[list[tuple[int, list[Message]]], list[Message]]:
+        """Complete (block, messages) chunks and the tail of the newest block.
+
+        Blocks are cut on the absolute timeline index, so every participant
+        gets the same chunks, and the same cache keys, for the same messages
+        whatever their buffer start. The first chunk may be partial.
+        """
+        size = self.chunk_size
+
+        if messages[0].index is None or messages[-1].index is None:
+            positions = range(len(messages))
+        else:
+            positions = [message.index for message in messages]
+
+        blocks: list[tuple[int, list[Message]]] = []
+
+        for position, message in zip(positions, messages):
+            block = position // size
+
+            if blocks and blocks[-1][0] == block:
+                blocks[-1][1].append(message)
+            else:
+                blocks.append((block, [message]))
+
+        # the newest block is reported as it is until the timeline moves past it.
+        if (positions[-1] + 1) % size:
+            return blocks[:-1], blocks[-1][1]
+
+        return blocks, []
+
+    def _summary(self, parts: list[str], build) -> ReportSteps:
+        key = self.cache.key(parts)
+
+        summary = self.cache.get(key)
+
+        if summary is None:
+            summary = yield (*build(), key)
+            self.cache.set(key, summary)
+
+        return summary
+
+    def _batch_plan(
+        self, requests: list[tuple[str, list[Message]]]
+    ) -> tuple[list[str | None], list[ReportBatch], dict[str, str]]:
+        keys = []
+        reports = {}
+        pending = {}
+
+        for participant, messages in requests:
+            if not messages:
+                keys.append(None)
+                continue
+
+            window = self._window(participant, messages)
+            key = self.cache.key([self._scope(participant), *map(str, window)])
+            keys.append(key)
+
+            if key in reports or key in pending:
+                continue
+
+            cached = self.cache.get(key)
+
+            if cached is None:
+                pending[key] = (key, participant, window)
+            else:
+                reports[key] = cached
+
+        # split the pending reports into batches fitting the token budget, and
+        # whose reports fit the output limit together.
+        batches = []
+        batch = []
+        tokens = 0
+        output_limit = self.max_output_tokens or float("inf")
+
+        for item in pending.values():
+            cost = sum(map(message_tokens, item[2]))
+
+            if batch and (
+                tokens + cost > self.max_batch_tokens
+                or output_budget(tokens + cost) > output_limit
+            ):
+                batches.append(batch)
+                batch = []
+                tokens = 0
+
+            batch.append(item)
+            tokens += cost
 
+        if batch:
+            batches.append(batch)
+
+        return keys, batches, reports
+
+    def _batch_prompt(self, batch: ReportBatch) -> tuple[str, list[str], int]:
+        report_ids = _report_ids(batch)
+
+        sections = [
+            (report_id, None if self.neutral else participant, messages)
+            for report_id, (_, participant, messages) in zip(report_ids, batch)
+        ]
+
+        prompt = self.batch_template(sections)
+
+        max_output_tokens = output_budget(
+            sum([message_tokens(m) for _, _, messages in batch for m in messages]),
+            self.max_output_tokens,
+        )
+
+        return prompt, report_ids, max_output_tokens
+
+    def _record(self, usage: Usage | None):
+        self.usage.record(REPORTER, self.provider, self.model, usage)
+
+        if usage:
+            settle_usage(usage.total_tokens)
+
+    def _emit(
+        self,
+        start: float | None,
+        prompt: str,
+        error: BaseException | None,
+        reports: int = 1,
+    ):
+        self.instrumentation.emit(
+            "reporter.request",
+            start,
+            provider=self.provider,
+            model=self.model,
+            prompt_tokens=estimate_tokens(prompt),
+            reports=reports,
+            error=type(error).__name__ if error else None,
+        )
+
+
+class AbstractReporter(BaseReporter):
     def __call__(self, participant: str, messages: list[Message]) -> str:
         if not messages:
             return ""
 
-        last_messages = messages[-self.max_messages :] if self.max_messages > 0 else []
+        steps = self._report_steps(participant, messages)
+
+        try:
+            prompt, max_output_tokens, _ = next(steps)
 
-        prompt = self.template(participant, last_messages)
+            while True:
+                report = self._request(prompt, max_output_tokens)
+                prompt, max_output_tokens, _ = steps.send(report)
+        except StopIteration as stop:
+            return stop.value
 
-        max_output_tokens = sum([len(str(m)) for m in last_messages])
+    def extend(self, participant: str, briefing: str, messages: list[Message]) -> str:
+        if not briefing:
+            return self(participant, messages)
+
+        if not messages:
+            return briefing
 
-        return self._generate_report(prompt, max_output_tokens=max_output_tokens)
+        prompt, max_output_tokens = self._extend_prompt(participant, briefing, messages)
+
+        return self._request(prompt, max_output_tokens)
+
+    def batch(self, requests: list[tuple[str, list[Message]]]) -> list[str]:
+        keys, batches, reports = self._batch_plan(requests)
+
+        for batch in batches:
+            reports.update(self._generate_batch(batch))
+
+        return [reports[key] if key else "" for key in keys]
+
+    def _generate_batch(self, batch: ReportBatch) -> dict[str, str]:
+        generated = self._batch_request(batch) if self.structured_batches else {}
+        reports = {}
+
+        for report_id, (key, participant, window) in zip(_report_ids(batch), batch):
+            # a report missing from the batch response is generated on its own.
+            report = generated.get(report_id) or self._request(
+                *self._prompt(participant, window)
+            )
+            self.cache.set(key, report)
+            reports[key] = report
+
+        return reports
+
+    def _batch_request(self, batch: ReportBatch) -> dict[str, str]:
+        prompt, report_ids, max_output_tokens = self._batch_prompt(batch)
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        start = self.instrumentation.start()
+        error = None
+
+        try:
+            with self.limits.limit_sync(self.provider, self.model, tokens):
+                return self._generate_reports(
+                    prompt, report_ids, max_output_tokens=max_output_tokens
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error, reports=len(report_ids))
+
+    def _request(self, prompt: str, max_output_tokens: int) -> str:
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        start = self.instrumentation.start()
+        error = None
+
+        try:
+            with self.limits.limit_sync(self.provider, self.model, tokens):
+                return self._generate_report(
+                    prompt, max_output_tokens=max_output_tokens
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error)
 
     @abstractmethod
     def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
         pass
+
+    def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        # without structured batches the reports are generated one by one.
+        return {}
+
+
+class AbstractAsyncReporter(BaseReporter):
+    async def __call__(self, participant: str, messages: list[Message]) -> str:
+        if not messages:
+            return ""
+
+        steps = self._report_steps(participant, messages)
+
+        try:
+            prompt, max_output_tokens, key = next(steps)
+
+            while True:
+                report = await self._shared_request(key, prompt, max_output_tokens)
+                prompt, max_output_tokens, key = steps.send(report)
+        except StopIteration as stop:
+            return stop.value
+
+    async def extend(
+        self, participant: str, briefing: str, messages: list[Message]
+    ) -> str:
+        if not briefing:
+            return await self(participant, messages)
+
+        if not messages:
+            return briefing
+
+        prompt, max_output_tokens = self._extend_prompt(participant, briefing, messages)
+
+        return await self._request(prompt, max_output_tokens)
+
+    async def batch(self, requests: list[tuple[str, list[Message]]]) -> list[str]:
+        keys, batches, reports = self._batch_plan(requests)
+
+        generated = await asyncio.gather(
+            *[self._generate_batch(batch) for batch in batches]
+        )
+
+        for batch_reports in generated:
+            reports.update(batch_reports)
+
+        return [reports[key] if key else "" for key in keys]
+
+    async def _generate_batch(self, batch: ReportBatch) -> dict[str, str]:
+        if self.structured_batches:
+            generated = await self._batch_request(batch)
+        else:
+            generated = {}
+
+        # the reports missing from the batch response are generated on their own.
+        report_ids = _report_ids(batch)
+        missing = [i for i, id in enumerate(report_ids) if not generated.get(id)]
+        singles = await asyncio.gather(
+            *[
+                self._shared_request(batch[i][0], *self._prompt(*batch[i][1:]))
+                for i in missing
+            ]
+        )
+
+        for i, report in zip(missing, singles):
+            generated[report_ids[i]] = report
+
+        reports = {}
+
+        for report_id, (key, _, _) in zip(report_ids, batch):
+            self.cache.set(key, generated[report_id])
+            reports[key] = generated[report_id]
+
+        return reports
+
+    async def _batch_request(self, batch: ReportBatch) -> dict[str, str]:
+        prompt, report_ids, max_output_tokens = self._batch_prompt(batch)
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        start = self.instrumentation.start()
+        error = None
+
+        try:
+            async with self.limits.limit(self.provider, self.model, tokens):
+                return await self._generate_reports(
+                    prompt, report_ids, max_output_tokens=max_output_tokens
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error, reports=len(report_ids))
+
+    async def _shared_request(
+        self, key: str | None, prompt: str, max_output_tokens: int
+    ) -> str:
+        # concurrent reports of the same cache key wait for a single request.
+        if key is None:
+            return await self._request(prompt, max_output_tokens)
+
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._request(prompt, max_output_tokens))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._in_flight[key] = task
+
+        # a cancelled caller does not cancel the request the others wait for.
+        return await asyncio.shield(task)
+
+    async def _request(self, prompt: str, max_output_tokens: int) -> str:
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        start = self.instrumentation.start()
+        error = None
+
+        try:
+            async with self.limits.limit(self.provider, self.model, tokens):
+                return await self._generate_report(
+                    prompt, max_output_tokens=max_output_tokens
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error)
+
+    @abstractmethod
+    async def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
+        pass
+
+    async def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        # without structured batches the reports are generated one by one.
+        return {}
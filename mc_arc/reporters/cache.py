@@ -0,0 +1,53 @@
+import hashlib
+from collections import OrderedDict
+
+
+class ReportCache:
+    """Content addressed LRU cache of reports, bounded by entries and by size."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def key(parts: list[str]) -> str:
+        return hashlib.sha1("\x00".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        report = self._entries.get(key)
+
+        if report is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        return report
+
+    def set(self, key: str, report: str):
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+
+        self._entries[key] = report
+        self.size += len(report)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.size > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
@@ -1,33 +1,130 @@
-from google.genai import types
-from .base import AbstractReporter
+import json
+from typing import TYPE_CHECKING
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractReporter, AbstractAsyncReporter
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+
+def _reports_config(
+    reporter, report_ids: list[str], max_output_tokens: int
+) -> "types.GenerateContentConfig":
+    from google.genai import types
+
+    schema = types.Schema(
+        type=types.Type.OBJECT,
+        properties={r: types.Schema(type=types.Type.STRING) for r in report_ids},
+        required=report_ids,
+    )
+
+    return types.GenerateContentConfig(
+        temperature=reporter.temperature,
+        max_output_tokens=max_output_tokens,
+        response_mime_type="application/json",
+        response_schema=schema,
+    )
+
+
+def _report_config(reporter, max_output_tokens: int) -> "types.GenerateContentConfig":
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        temperature=reporter.temperature,
+        max_output_tokens=max_output_tokens,
+    )
 
 
 class GeminiReporter(AbstractReporter):
+    provider = "gemini"
+    structured_batches = True
+
     def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
         response = self.client.models.generate_content(
             model=self.model,
             contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=self.temperature,
-                max_output_tokens=max_output_tokens,
-            ),
+            config=_report_config(self, max_output_tokens),
+        )
+        self._record(Usage.from_gemini(response))
+        return response.text
+
+    def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=_reports_config(self, report_ids, max_output_tokens),
+        )
+        self._record(Usage.from_gemini(response))
+        return json.loads(response.text)
+
+
+class AsyncGeminiReporter(AbstractAsyncReporter):
+    provider = "gemini"
+    structured_batches = True
+
+    async def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=_report_config(self, max_output_tokens),
         )
+        self._record(Usage.from_gemini(response))
         return response.text
 
+    async def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=_reports_config(self, report_ids, max_output_tokens),
+        )
+        self._record(Usage.from_gemini(response))
+        return json.loads(response.text)
+
 
 def create_gemini_reporter(
     model: str = "gemini-2.0-flash",
     api_key: str | None = None,
     temperature: float = 0.2,
     max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
 ):
     """Factory function that creates client and reporter together."""
-    try:
-        from google import genai
-    except ImportError:
-        raise ImportError(
-            "google-generativeai package not installed. Install with: pip install google-generativeai"
-        )
+    client = default_clients.gemini(api_key)
+    return GeminiReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
 
-    client = genai.Client(api_key=api_key)
-    return GeminiReporter(model, client, temperature, max_messages)
+
+def create_async_gemini_reporter(
+    model: str = "gemini-2.0-flash",
+    api_key: str | None = None,
+    temperature: float = 0.2,
+    max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
+):
+    """Factory function that creates client and async reporter together."""
+    client = default_clients.gemini(api_key)
+    return AsyncGeminiReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
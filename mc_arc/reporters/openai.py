@@ -1,7 +1,30 @@
-from .base import AbstractReporter
+import json
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractReporter, AbstractAsyncReporter, reports_schema
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+
+def _reports_request(
+    reporter, prompt: str, report_ids: list[str], max_output_tokens: int
+) -> dict:
+    return {
+        "model": reporter.model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": reporter.temperature,
+        "max_tokens": max_output_tokens,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "reports", "schema": reports_schema(report_ids)},
+        },
+    }
 
 
 class OpenAIReporter(AbstractReporter):
+    provider = "openai"
+    structured_batches = True
+
     def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
@@ -9,25 +32,63 @@ class OpenAIReporter(AbstractReporter):
             temperature=self.temperature,
             max_tokens=max_output_tokens,
         )
+        self._record(Usage.from_openai(response))
         return response.choices[0].message.content
 
+    def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = self.client.chat.completions.create(
+            **_reports_request(self, prompt, report_ids, max_output_tokens)
+        )
+        self._record(Usage.from_openai(response))
+        return json.loads(response.choices[0].message.content)
+
+
+class AsyncOpenAIReporter(AbstractAsyncReporter):
+    provider = "openai"
+    structured_batches = True
+
+    async def _generate_report(self, prompt: str, max_output_tokens: int) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+            max_tokens=max_output_tokens,
+        )
+        self._record(Usage.from_openai(response))
+        return response.choices[0].message.content
+
+    async def _generate_reports(
+        self, prompt: str, report_ids: list[str], max_output_tokens: int
+    ) -> dict[str, str]:
+        response = await self.client.chat.completions.create(
+            **_reports_request(self, prompt, report_ids, max_output_tokens)
+        )
+        self._record(Usage.from_openai(response))
+        return json.loads(response.choices[0].message.content)
+
 
 def create_openai_reporter(
     model: str = "gpt-4",
     api_key: str | None = None,
     temperature: float = 0.2,
     max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
 ):
     """Factory function that creates client and reporter together."""
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise ImportError(
-            "openai package not installed. Install with: pip install openai"
-        )
-
-    client = OpenAI(api_key=api_key)
-    return OpenAIReporter(model, client, temperature, max_messages)
+    client = default_clients.openai(api_key)
+    return OpenAIReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
 
 
 def create_openrouter_reporter(
@@ -35,14 +96,66 @@ def create_openrouter_reporter(
     api_key: str | None = None,
     temperature: float = 0.2,
     max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
 ):
     """Factory function for OpenRouter (uses OpenAI client with different base_url)."""
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise ImportError(
-            "openai package not installed. Install with: pip install openai"
-        )
+    client = default_clients.openai(api_key, OPENROUTER_BASE_URL)
+    reporter = OpenAIReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
+    reporter.provider = "openrouter"
+    return reporter
+
 
-    client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
-    return OpenAIReporter(model, client, temperature, max_messages)
+def create_async_openai_reporter(
+    model: str = "gpt-4",
+    api_key: str | None = None,
+    temperature: float = 0.2,
+    max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
+):
+    """Factory function that creates async client and reporter together."""
+    client = default_clients.openai(api_key, aio=True)
+    return AsyncOpenAIReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
+
+
+def create_async_openrouter_reporter(
+    model: str,
+    api_key: str | None = None,
+    temperature: float = 0.2,
+    max_messages: int = 100,
+    max_tokens: int | None = None,
+    chunk_size: int = 0,
+    neutral: bool = False,
+):
+    """Factory function for OpenRouter using the async OpenAI client."""
+    client = default_clients.openai(api_key, OPENROUTER_BASE_URL, aio=True)
+    reporter = AsyncOpenAIReporter(
+        model,
+        client,
+        temperature,
+        max_messages,
+        max_tokens=max_tokens,
+        chunk_size=chunk_size,
+        neutral=neutral,
+    )
+    reporter.provider = "openrouter"
+    return reporter
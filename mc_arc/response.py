@@ -1,21 +1,166 @@
+import re
+import time
+import asyncio
+from dataclasses import dataclass
 from typing import AsyncGenerator
+from mc_arc.instrumentation import Instrumentation, default_instrumentation
 from mc_arc.interfaces import AgentResponse
 
+SENTENCE_END = re.compile(r"[.!?\n][\"')\]]*\s*$")
+
+
+@dataclass
+class Coalescing:
+    """How provider chunks are merged before reaching the consumer.
+
+    Pending text is flushed once it reaches max_chars, ends a sentence or has
+    waited max_delay seconds. At most max_buffered provider chunks are read
+    ahead of a slow consumer, the provider stream is not pulled beyond that.
+    """
+
+    max_chars: int = 256
+    max_delay: float = 0.05
+    sentence_boundary: bool = True
+    max_buffered: int = 64
+
+    def should_flush(self, text: str) -> bool:
+        return len(text) >= self.max_chars or bool(
+            self.sentence_boundary and SENTENCE_END.search(text)
+        )
+
+
+class _StreamEnd:
+    def __init__(self, error: BaseException | None = None):
+        self.error = error
+
+
+class ChunkBuffer:
+    """Accumulates chunks in a list, joined only when the text is requested."""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.length = 0
+        self._text = ""
+        self._joined = 0
+
+    def append(self, chunk: str):
+        self.chunks.append(chunk)
+        self.length += len(chunk)
+
+    def text(self, count: int | None = None, length: int | None = None) -> str:
+        count = len(self.chunks) if count is None else count
+
+        if count > self._joined:
+            self._text += "".join(self.chunks[self._joined : count])
+            self._joined = count
+
+        if length is None or length == len(self._text):
+            return self._text
+
+        return self._text[:length]
+
+
+class CumulativeText:
+    """Length tagged view of the text streamed so far, materialized on demand."""
+
+    __slots__ = ("buffer", "count", "length")
+
+    def __init__(self, buffer: ChunkBuffer):
+        self.buffer = buffer
+        self.count = len(buffer.chunks)
+        self.length = buffer.length
+
+    def __str__(self):
+        return self.buffer.text(self.count, self.length)
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __add__(self, other: str):
+        return str(self) + other
+
+    def __radd__(self, other: str):
+        return other + str(self)
+
+    # special methods are looked up on the type, __getattr__ does not see them.
+    def __getitem__(self, index):
+        return str(self)[index]
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __contains__(self, text: str):
+        return text in str(self)
+
+    def __format__(self, format_spec: str):
+        return format(str(self), format_spec)
+
+    def __getattr__(self, name: str):
+        # str methods (strip, split...) work on the materialized text.
+        return getattr(str(self), name)
+
 
 class StreamingResponse:
-    def __init__(self, name: str, response: AgentResponse, cumulative: bool = False):
+    def __init__(
+        self,
+        name: str,
+        response: AgentResponse,
+        cumulative: bool = False,
+        coalescing: Coalescing | None = None,
+        instrumentation: Instrumentation | None = None,
+    ):
         self.name = name
         self.response = response
         self.cumulative = cumulative
-        self.full_response = ""
+        self.coalescing = coalescing
+        self.instrumentation = instrumentation or default_instrumentation
+        self.buffer = ChunkBuffer()
+        self.interrupted = False
         self._generator = None
+        self._reader: asyncio.Task | None = None
+        self._queue: asyncio.Queue | None = None
+        self._pending = ""
+        # the consumer task while it waits for a chunk, woken up by interrupt.
+        self._waiting: asyncio.Task | None = None
+
+    @property
+    def full_response(self) -> str:
+        return self.buffer.text()
 
     async def __aenter__(self):
         self._generator = self._create_chunk_generator()
         return self._generator
 
+    def interrupt(self):
+        """Stops the stream, the provider stream is closed and nothing is drained.
+
+        A consumer waiting for a chunk is woken up at once, a stalled provider
+        does not hold the connection. Otherwise the stream ends when the
+        consumer pulls again. The chunks already yielded stay in the buffer,
+        with the coalesced text not yet yielded, as the adapter history has it.
+        """
+        self.interrupted = True
+
+        if self.coalescing and (pending := self._take_pending()):
+            self.buffer.append(pending)
+
+        if self._waiting:
+            self._waiting.cancel()
+
+        if self._reader:
+            self._reader.cancel()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        # Ensure the response is fully consumed
+        # Ensure the response is fully consumed, an interrupted one just closes
         if self._generator:
             try:
                 async for _ in self._generator:
@@ -23,11 +168,148 @@ class StreamingResponse:
             except StopAsyncIteration:
                 pass
 
-    async def _create_chunk_generator(self) -> AsyncGenerator[tuple[str, str], None]:
-        async for chunk in self.response:
-            self.full_response += chunk
-            chunk_to_send = self.full_response if self.cumulative else chunk
+    async def _create_chunk_generator(
+        self,
+    ) -> AsyncGenerator[tuple[str, str | CumulativeText], None]:
+        source = self._coalesce() if self.coalescing else self.response
+
+        # chunks are only wrapped when someone listens.
+        if self.instrumentation.enabled:
+            chunks = self._instrument(source)
+        else:
+            chunks = source
+
+        task = asyncio.current_task()
+
+        while not self.interrupted:
+            self._waiting = task
+
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                break
+            except asyncio.CancelledError:
+                if not self.interrupted:
+                    raise
+
+                # the cancellation came from interrupt, the consumer goes on.
+                task.uncancel()
+                break
+            finally:
+                self._waiting = None
+
+            self.buffer.append(chunk)
+            chunk_to_send = CumulativeText(self.buffer) if self.cumulative else chunk
             yield (self.name, chunk_to_send)
 
+        if self.interrupted:
+            await self._close(chunks, source)
+
+    async def _close(self, *generators: AgentResponse):
+        # outermost first, the adapter generator closes the provider stream.
+        for generator in generators:
+            await generator.aclose()
+
+        if self._reader:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+        await self.response.aclose()
+
+    async def _instrument(self, chunks: AgentResponse) -> AgentResponse:
+        instrumentation = self.instrumentation
+        start = instrumentation.start()
+        count = 0
+        error = None
+
+        try:
+            async for chunk in chunks:
+                if not count:
+                    instrumentation.emit("first_chunk", start, participant=self.name)
+
+                count += 1
+                yield chunk
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+
+            instrumentation.emit(
+                "stream",
+                start,
+                participant=self.name,
+                chunks=count,
+                chars=self.buffer.length,
+                chunks_per_second=count / elapsed if elapsed else 0.0,
+                error=error,
+            )
+
+    async def _coalesce(self) -> AgentResponse:
+        config = self.coalescing
+        queue: asyncio.Queue[str | _StreamEnd] = asyncio.Queue(config.max_buffered)
+        reader = self._reader = asyncio.create_task(self._read_ahead(queue))
+        self._queue = queue
+
+        # pending text is reset before it is yielded, interrupt takes the rest.
+        deadline = 0.0
+
+        try:
+            while True:
+                timeout = (
+                    max(deadline - time.monotonic(), 0) if self._pending else None
+                )
+
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    chunk, self._pending = self._pending, ""
+                    yield chunk
+                    continue
+
+                if isinstance(item, _StreamEnd):
+                    if self._pending:
+                        chunk, self._pending = self._pending, ""
+                        yield chunk
+
+                    if item.error:
+                        raise item.error
+
+                    return
+
+                if not self._pending:
+                    deadline = time.monotonic() + config.max_delay
+
+                self._pending += item
+
+                if config.should_flush(self._pending):
+                    chunk, self._pending = self._pending, ""
+                    yield chunk
+        finally:
+            reader.cancel()
+
+    def _take_pending(self) -> str:
+        # the text read from the provider but not yet yielded to the consumer.
+        items = [self._pending]
+        self._pending = ""
+
+        while self._queue and not self._queue.empty():
+            item = self._queue.get_nowait()
+
+            if not isinstance(item, _StreamEnd):
+                items.append(item)
+
+        return "".join(items)
+
+    async def _read_ahead(self, queue: asyncio.Queue):
+        # the bounded queue blocks this reader when the consumer falls behind.
+        try:
+            async for chunk in self.response:
+                await queue.put(chunk)
+        except Exception as error:
+            await queue.put(_StreamEnd(error))
+        else:
+            await queue.put(_StreamEnd())
+
     def get_full_response(self) -> str:
         return self.full_response.strip()
@@ -0,0 +1,110 @@
+import re
+import math
+import heapq
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter
+from mc_arc.interfaces import Message
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+class RetrievalIndex(ABC):
+    """Index of the committed messages, searched for the older relevant ones.
+
+    Indexes are MasterOfCeremony subscribers: `mc.subscribe(index)` adds every
+    committed message with its timeline index, in increasing order.
+    """
+
+    def __call__(self, message: Message, index: int):
+        self.add(message, index)
+
+    @abstractmethod
+    def add(self, message: Message, index: int):
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        k: int,
+        start: int = 0,
+        end: int | None = None,
+        exclude: str | None = None,
+    ) -> list[Message]:
+        """The k best matches in [start, end) not sent by exclude, oldest first."""
+        pass
+
+
+class BM25Index(RetrievalIndex):
+    """Incremental BM25 over the message contents and sender names.
+
+    Postings are kept sorted by timeline index so a search only scores the
+    requested range. Terms found in more than half of the messages carry
+    almost no weight and are skipped like stop words.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.messages: dict[int, Message] = {}
+        self.lengths: dict[int, int] = {}
+        self.total_length = 0
+        # term -> (timeline indexes, term frequencies)
+        self.postings: dict[str, tuple[list[int], list[int]]] = {}
+
+    def add(self, message: Message, index: int):
+        terms = tokenize(str(message))
+
+        self.messages[index] = message
+        self.lengths[index] = len(terms)
+        self.total_length += len(terms)
+
+        for term, frequency in Counter(terms).items():
+            indexes, frequencies = self.postings.setdefault(term, ([], []))
+            indexes.append(index)
+            frequencies.append(frequency)
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        start: int = 0,
+        end: int | None = None,
+        exclude: str | None = None,
+    ) -> list[Message]:
+        count = len(self.lengths)
+
+        if not count or k <= 0:
+            return []
+
+        average = self.total_length / count
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            indexes, frequencies = self.postings.get(term, ([], []))
+            found = len(indexes)
+
+            if not found or found * 2 > count:
+                continue
+
+            idf = math.log(1 + (count - found + 0.5) / (found + 0.5))
+            low = bisect_left(indexes, start)
+            high = found if end is None else bisect_left(indexes, end, low)
+
+            for i in range(low, high):
+                index, frequency = indexes[i], frequencies[i]
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / average)
+                score = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores[index] = scores.get(index, 0.0) + score
+
+        candidates = [
+            i for i in scores if exclude is None or self.messages[i].name != exclude
+        ]
+        best = heapq.nlargest(k, candidates, key=scores.__getitem__)
+
+        return [self.messages[i] for i in sorted(best)]
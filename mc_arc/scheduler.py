@@ -0,0 +1,104 @@
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Hashable
+from mc_arc.mc import MasterOfCeremony
+from mc_arc.limits import RateLimits, current_session, default_limits
+from mc_arc.usage import Budget, BudgetExceeded
+
+
+@dataclass
+class Session:
+    id: Hashable
+    mc: MasterOfCeremony
+    turns: int | None = None
+    on_chunk: Callable[[Hashable, str, str], None] | None = None
+    completed: int = 0
+    exceeded: Budget | None = None
+    # the error that ended the session, the other sessions go on.
+    error: Exception | None = None
+
+
+class SessionScheduler:
+    """Drives many conversations concurrently on a single event loop.
+
+    Every provider request made by a session is tagged with its id so the
+    shared rate limiters queue the sessions fairly.
+    """
+
+    def __init__(self, limits: RateLimits | None = None):
+        self.limits = limits or default_limits
+        self.sessions: dict[Hashable, Session] = {}
+        self.started: float | None = None
+        self.stopped: float | None = None
+
+    def add_session(
+        self,
+        mc: MasterOfCeremony,
+        session_id: Hashable = None,
+        turns: int | None = None,
+        on_chunk: Callable[[Hashable, str, str], None] | None = None,
+    ) -> Session:
+        session_id = len(self.sessions) if session_id is None else session_id
+
+        if session_id in self.sessions:
+            raise ValueError(f"Session {session_id} already exists.")
+
+        session = Session(session_id, mc, turns, on_chunk)
+        self.sessions[session_id] = session
+
+        return session
+
+    async def run(self):
+        self.started = time.monotonic()
+
+        try:
+            await asyncio.gather(*[self._drive(s) for s in self.sessions.values()])
+        finally:
+            self.stopped = time.monotonic()
+
+    async def _drive(self, session: Session):
+        current_session.set(session.id)
+
+        while session.turns is None or session.completed < session.turns:
+            try:
+                async with session.mc.step() as stream:
+                    async for name, chunk in stream:
+                        if session.on_chunk:
+                            session.on_chunk(session.id, name, chunk)
+            except BudgetExceeded as error:
+                session.exceeded = error.budget
+                return
+            except Exception as error:
+                session.error = error
+                return
+
+            session.completed += 1
+
+    @property
+    def turns(self) -> int:
+        return sum([s.completed for s in self.sessions.values()])
+
+    def stats(self) -> dict:
+        end = self.stopped or time.monotonic()
+        elapsed = end - self.started if self.started else 0.0
+
+        limiters = {
+            f"{provider}/{model or '*'}": {
+                "completed": limiter.completed,
+                "in_flight": limiter.in_flight,
+                "tokens": limiter.consumed_tokens,
+                "requests_per_second": limiter.completed / elapsed if elapsed else 0.0,
+            }
+            for (provider, model), limiter in self.limits.limiters.items()
+        }
+
+        return {
+            "sessions": len(self.sessions),
+            "turns": self.turns,
+            "elapsed": elapsed,
+            "turns_per_second": self.turns / elapsed if elapsed else 0.0,
+            "stopped": sum([1 for s in self.sessions.values() if s.exceeded]),
+            "failed": sum([1 for s in self.sessions.values() if s.error]),
+            "limiters": limiters,
+        }
@@ -1,19 +1,78 @@
-from .base import AbstractParticipantSelector
-from .gemini import GeminiParticipantSelector, create_gemini_selector
-from .anthropic import AnthropicParticipantSelector, create_anthropic_selector
-from .openai import (
-    OpenAIParticipantSelector,
-    create_openai_selector,
-    create_openrouter_selector,
+from typing import TYPE_CHECKING
+from mc_arc.utils import lazy_exports
+from .base import AbstractParticipantSelector, AbstractAsyncParticipantSelector
+from .heuristics import (
+    HeuristicSelector,
+    MentionSelector,
+    RoundRobinSelector,
+    TurnBalanceSelector,
+    RecencyDecaySelector,
+    HybridSelector,
 )
 
+# provider selectors are loaded on first access, with their provider sdk.
+_EXPORTS = {
+    "GeminiParticipantSelector": ".gemini",
+    "AsyncGeminiParticipantSelector": ".gemini",
+    "create_gemini_selector": ".gemini",
+    "create_async_gemini_selector": ".gemini",
+    "AnthropicParticipantSelector": ".anthropic",
+    "AsyncAnthropicParticipantSelector": ".anthropic",
+    "create_anthropic_selector": ".anthropic",
+    "create_async_anthropic_selector": ".anthropic",
+    "OpenAIParticipantSelector": ".openai",
+    "AsyncOpenAIParticipantSelector": ".openai",
+    "create_openai_selector": ".openai",
+    "create_openrouter_selector": ".openai",
+    "create_async_openai_selector": ".openai",
+    "create_async_openrouter_selector": ".openai",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .gemini import (
+        GeminiParticipantSelector,
+        AsyncGeminiParticipantSelector,
+        create_gemini_selector,
+        create_async_gemini_selector,
+    )
+    from .anthropic import (
+        AnthropicParticipantSelector,
+        AsyncAnthropicParticipantSelector,
+        create_anthropic_selector,
+        create_async_anthropic_selector,
+    )
+    from .openai import (
+        OpenAIParticipantSelector,
+        AsyncOpenAIParticipantSelector,
+        create_openai_selector,
+        create_openrouter_selector,
+        create_async_openai_selector,
+        create_async_openrouter_selector,
+    )
+
 __all__ = [
     "AbstractParticipantSelector",
+    "AbstractAsyncParticipantSelector",
+    "HeuristicSelector",
+    "MentionSelector",
+    "RoundRobinSelector",
+    "TurnBalanceSelector",
+    "RecencyDecaySelector",
+    "HybridSelector",
     "GeminiParticipantSelector",
     "OpenAIParticipantSelector",
     "AnthropicParticipantSelector",
+    "AsyncGeminiParticipantSelector",
+    "AsyncOpenAIParticipantSelector",
+    "AsyncAnthropicParticipantSelector",
     "create_gemini_selector",
     "create_openai_selector",
     "create_openrouter_selector",
     "create_anthropic_selector",
+    "create_async_gemini_selector",
+    "create_async_openai_selector",
+    "create_async_openrouter_selector",
+    "create_async_anthropic_selector",
 ]
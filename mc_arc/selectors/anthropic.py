@@ -1,47 +1,79 @@
-from .base import AbstractParticipantSelector
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractParticipantSelector, AbstractAsyncParticipantSelector
 
 
-class AnthropicParticipantSelector(AbstractParticipantSelector):
-    def _select_participant(self, participants, prompt):
-        tool = {
-            "name": "select_participant",
-            "description": "Select a participant",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "selected_participant": {"type": "string", "enum": participants}
-                },
-                "required": ["selected_participant"],
+def _selection_request(model: str, participants: list[str], prompt: str) -> dict:
+    tool = {
+        "name": "select_participant",
+        "description": "Select a participant",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "selected_participant": {"type": "string", "enum": participants}
             },
-        }
+            "required": ["selected_participant"],
+        },
+    }
+
+    return {
+        "model": model,
+        "max_tokens": 100,
+        "messages": [{"role": "user", "content": prompt}],
+        "tools": [tool],
+        "tool_choice": {"type": "tool", "name": "select_participant"},
+    }
+
+
+def _parse_selection(participants: list[str], response) -> str:
+    for content in response.content:
+        if content.type == "tool_use":
+            return content.input["selected_participant"]
 
+    return participants[0]  # fallback
+
+
+class AnthropicParticipantSelector(AbstractParticipantSelector):
+    provider = "anthropic"
+
+    def _select_participant(self, participants, prompt):
         response = self.client.messages.create(
-            model=self.model,
-            max_tokens=100,
-            messages=[{"role": "user", "content": prompt}],
-            tools=[tool],
-            tool_choice={"type": "tool", "name": "select_participant"},
+            **_selection_request(self.model, participants, prompt)
         )
 
-        for content in response.content:
-            if content.type == "tool_use":
-                return content.input["selected_participant"]
+        self._record(Usage.from_anthropic(response))
+        return _parse_selection(participants, response)
 
-        return participants[0]  # fallback
+
+class AsyncAnthropicParticipantSelector(AbstractAsyncParticipantSelector):
+    provider = "anthropic"
+
+    async def _select_participant(self, participants, prompt):
+        response = await self.client.messages.create(
+            **_selection_request(self.model, participants, prompt)
+        )
+
+        self._record(Usage.from_anthropic(response))
+        return _parse_selection(participants, response)
 
 
 def create_anthropic_selector(
     model: str = "claude-3-5-sonnet-20241022",
     api_key: str | None = None,
     max_messages: int = 10,
+    max_tokens: int | None = None,
 ):
     """Factory function that creates client and selector together."""
-    try:
-        from anthropic import Anthropic
-    except ImportError:
-        raise ImportError(
-            "anthropic package not installed. Install with: pip install anthropic"
-        )
+    client = default_clients.anthropic(api_key)
+    return AnthropicParticipantSelector(model, client, max_messages, max_tokens)
 
-    client = Anthropic(api_key=api_key)
-    return AnthropicParticipantSelector(model, client, max_messages)
+
+def create_async_anthropic_selector(
+    model: str = "claude-3-5-sonnet-20241022",
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
+):
+    """Factory function that creates async client and selector together."""
+    client = default_clients.anthropic(api_key, aio=True)
+    return AsyncAnthropicParticipantSelector(model, client, max_messages, max_tokens)
@@ -1,23 +1,96 @@
 from abc import ABC, abstractmethod
 from typing import Any
+from mc_arc.instrumentation import Instrumentation, default_instrumentation
 from mc_arc.interfaces import Message
 from mc_arc.prompts import SELECTOR_PROMPT_TEMPLATE
+from mc_arc.limits import RateLimits, default_limits, settle_usage
+from mc_arc.usage import SELECTOR, Usage, UsageTracker, default_usage
+from mc_arc.tokens import estimate_tokens, token_window
 
 
-class AbstractParticipantSelector(ABC):
-    def __init__(self, model: str, client: Any, max_messages: int = 10):
+class BaseParticipantSelector(ABC):
+    provider = ""
+
+    def __init__(
+        self,
+        model: str,
+        client: Any,
+        max_messages: int = 10,
+        max_tokens: int | None = None,
+        limits: RateLimits | None = None,
+        instrumentation: Instrumentation | None = None,
+        usage: UsageTracker | None = None,
+    ):
         self.model = model
         self.client = client
         self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.limits = limits or default_limits
+        self.instrumentation = instrumentation or default_instrumentation
+        self.usage = usage or default_usage
         self.template = SELECTOR_PROMPT_TEMPLATE
 
-    def __call__(self, participants: list[str], messages: list[Message]) -> str:
-        last_messages = messages[-self.max_messages :] if self.max_messages > 0 else []
+    def _prompt(self, participants: list[str], messages: list[Message]) -> str:
+        last_messages = token_window(messages, self.max_messages, self.max_tokens)
+
+        return self.template(participants, last_messages)
+
+    def _record(self, usage: Usage | None):
+        self.usage.record(SELECTOR, self.provider, self.model, usage)
+
+        if usage:
+            settle_usage(usage.total_tokens)
+
+    def _emit(self, start: float | None, prompt: str, error: BaseException | None):
+        self.instrumentation.emit(
+            "selector.request",
+            start,
+            provider=self.provider,
+            model=self.model,
+            prompt_tokens=estimate_tokens(prompt),
+            error=type(error).__name__ if error else None,
+        )
+
 
-        prompt = self.template(participants, last_messages)
+class AbstractParticipantSelector(BaseParticipantSelector):
+    def __call__(self, participants: list[str], messages: list[Message]) -> str:
+        prompt = self._prompt(participants, messages)
+        start = self.instrumentation.start()
+        error = None
 
-        return self._select_participant(participants, prompt)
+        try:
+            with self.limits.limit_sync(
+                self.provider, self.model, estimate_tokens(prompt)
+            ):
+                return self._select_participant(participants, prompt)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error)
 
     @abstractmethod
     def _select_participant(self, participants: list[str], prompt: str) -> str:
         pass
+
+
+class AbstractAsyncParticipantSelector(BaseParticipantSelector):
+    async def __call__(self, participants: list[str], messages: list[Message]) -> str:
+        prompt = self._prompt(participants, messages)
+        start = self.instrumentation.start()
+        error = None
+
+        try:
+            async with self.limits.limit(
+                self.provider, self.model, estimate_tokens(prompt)
+            ):
+                return await self._select_participant(participants, prompt)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit(start, prompt, error)
+
+    @abstractmethod
+    async def _select_participant(self, participants: list[str], prompt: str) -> str:
+        pass
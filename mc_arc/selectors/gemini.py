@@ -1,34 +1,69 @@
 from enum import Enum
-from google.genai import types
-from .base import AbstractParticipantSelector
+from typing import TYPE_CHECKING
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractParticipantSelector, AbstractAsyncParticipantSelector
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+
+def _selection_config(participants: list[str]) -> "types.GenerateContentConfig":
+    from google.genai import types
+
+    OptionalParticipantEnum = Enum("ParticipantEnum", {p: p for p in participants})
+
+    return types.GenerateContentConfig(
+        response_mime_type="text/x.enum",
+        response_schema=OptionalParticipantEnum,
+    )
 
 
 class GeminiParticipantSelector(AbstractParticipantSelector):
-    def _select_participant(self, participants, prompt):
-        OptionalParticipantEnum = Enum("ParticipantEnum", {p: p for p in participants})
+    provider = "gemini"
 
+    def _select_participant(self, participants, prompt):
         response = self.client.models.generate_content(
             model=self.model,
             contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="text/x.enum",
-                response_schema=OptionalParticipantEnum,
-            ),
+            config=_selection_config(participants),
+        )
+
+        self._record(Usage.from_gemini(response))
+        return response.text
+
+
+class AsyncGeminiParticipantSelector(AbstractAsyncParticipantSelector):
+    provider = "gemini"
+
+    async def _select_participant(self, participants, prompt):
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=_selection_config(participants),
         )
 
+        self._record(Usage.from_gemini(response))
         return response.text
 
 
 def create_gemini_selector(
-    model: str = "gemini-2.0-flash", api_key: str | None = None, max_messages: int = 10
+    model: str = "gemini-2.0-flash",
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
 ):
     """Factory function that creates client and selector together."""
-    try:
-        from google import genai
-    except ImportError:
-        raise ImportError(
-            "google-generativeai package not installed. Install with: pip install google-generativeai"
-        )
+    client = default_clients.gemini(api_key)
+    return GeminiParticipantSelector(model, client, max_messages, max_tokens)
 
-    client = genai.Client(api_key=api_key)
-    return GeminiParticipantSelector(model, client, max_messages)
+
+def create_async_gemini_selector(
+    model: str = "gemini-2.0-flash",
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
+):
+    """Factory function that creates client and async selector together."""
+    client = default_clients.gemini(api_key)
+    return AsyncGeminiParticipantSelector(model, client, max_messages, max_tokens)
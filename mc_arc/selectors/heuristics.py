@@ -0,0 +1,152 @@
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Sequence
+from mc_arc.interfaces import Message, Selector, AsyncSelector
+from mc_arc.utils import maybe_await
+
+
+@lru_cache(maxsize=64)
+def _mention_pattern(names: tuple[str, ...]) -> re.Pattern:
+    # longest names first so "Ana" does not shadow "Anabel".
+    alternatives = "|".join(map(re.escape, sorted(names, key=len, reverse=True)))
+
+    return re.compile(rf"\b({alternatives})\b", re.IGNORECASE)
+
+
+class HeuristicSelector(ABC):
+    """Local selector choosing the participant with the highest score."""
+
+    def __call__(self, participants: list[str], messages: Sequence[Message]) -> str:
+        scores = self.scores(participants, messages)
+
+        name = max(participants, key=lambda p: scores[p])
+
+        self.record(participants, name)
+
+        return name
+
+    @abstractmethod
+    def scores(
+        self, participants: list[str], messages: Sequence[Message]
+    ) -> dict[str, float]:
+        pass
+
+    def record(self, participants: list[str], name: str):
+        pass
+
+
+class MentionSelector(HeuristicSelector):
+    """Scores the participants addressed by name in the last message."""
+
+    def scores(self, participants, messages):
+        scores = {p: 0.0 for p in participants}
+
+        if not messages or not participants:
+            return scores
+
+        by_lower = {p.lower(): p for p in participants}
+        pattern = _mention_pattern(tuple(participants))
+
+        for match in pattern.finditer(messages[-1].content):
+            scores[by_lower[match.group(1).lower()]] = 1.0
+
+        return scores
+
+
+class RoundRobinSelector(HeuristicSelector):
+    """Smooth weighted round robin, participants default to a weight of 1."""
+
+    def __init__(self, weights: dict[str, float] | None = None):
+        self.weights = weights or {}
+        self.current: dict[str, float] = {}
+
+    def scores(self, participants, messages):
+        return {
+            p: self.current.get(p, 0.0) + self.weights.get(p, 1.0) for p in participants
+        }
+
+    def record(self, participants, name):
+        for p in participants:
+            self.current[p] = self.current.get(p, 0.0) + self.weights.get(p, 1.0)
+
+        self.current[name] -= sum([self.weights.get(p, 1.0) for p in participants])
+
+
+class TurnBalanceSelector(HeuristicSelector):
+    """Favors the participants who spoke the least in the last `window` messages."""
+
+    def __init__(self, window: int = 50, weights: dict[str, float] | None = None):
+        self.window = window
+        self.weights = weights or {}
+
+    def scores(self, participants, messages):
+        turns = {p: 0 for p in participants}
+
+        for message in messages[-self.window :]:
+            if message.name in turns:
+                turns[message.name] += 1
+
+        return {p: -turns[p] / self.weights.get(p, 1.0) for p in participants}
+
+
+class RecencyDecaySelector(HeuristicSelector):
+    """Favors the participants who spoke the longest time ago.
+
+    Every past message of a participant counts `decay ** age` against it.
+    """
+
+    def __init__(self, decay: float = 0.8, window: int = 50):
+        self.decay = decay
+        self.window = window
+
+    def scores(self, participants, messages):
+        scores = {p: 0.0 for p in participants}
+        recent = messages[-self.window :]
+
+        for age, message in enumerate(reversed(recent)):
+            if message.name in scores:
+                scores[message.name] -= self.decay**age
+
+        return scores
+
+
+class HybridSelector:
+    """Uses the heuristic when its choice is clear, the fallback selector otherwise.
+
+    A choice is clear when the best score leads the second one by `margin`.
+    """
+
+    def __init__(
+        self,
+        fallback: Selector | AsyncSelector,
+        heuristic: HeuristicSelector | None = None,
+        margin: float = 0.5,
+    ):
+        self.fallback = fallback
+        self.heuristic = heuristic or MentionSelector()
+        self.margin = margin
+        self.escalations = 0
+
+    async def __call__(
+        self, participants: list[str], messages: Sequence[Message]
+    ) -> str:
+        scores = sorted(
+            self.heuristic.scores(participants, messages).items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+        if len(scores) == 1 or (scores and scores[0][1] - scores[1][1] >= self.margin):
+            self.heuristic.record(participants, scores[0][0])
+            return scores[0][0]
+
+        self.escalations += 1
+
+        name = await maybe_await(self.fallback(participants, messages))
+
+        # the heuristic state follows every choice, escalated ones included.
+        if name in participants:
+            self.heuristic.record(participants, name)
+
+        return name
@@ -1,55 +1,102 @@
 import json
-from .base import AbstractParticipantSelector
+from mc_arc.clients import default_clients
+from mc_arc.usage import Usage
+from .base import AbstractParticipantSelector, AbstractAsyncParticipantSelector
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+
+def _selection_request(model: str, participants: list[str], prompt: str) -> dict:
+    schema = {
+        "type": "object",
+        "properties": {
+            "selected_participant": {"type": "string", "enum": participants}
+        },
+        "required": ["selected_participant"],
+    }
+
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "participant_selection", "schema": schema},
+        },
+    }
+
+
+def _parse_selection(response) -> str:
+    result = json.loads(response.choices[0].message.content)
+    return result["selected_participant"]
 
 
 class OpenAIParticipantSelector(AbstractParticipantSelector):
-    def _select_participant(self, participants, prompt):
-        schema = {
-            "type": "object",
-            "properties": {
-                "selected_participant": {"type": "string", "enum": participants}
-            },
-            "required": ["selected_participant"],
-        }
+    provider = "openai"
 
+    def _select_participant(self, participants, prompt):
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {"name": "participant_selection", "schema": schema},
-            },
+            **_selection_request(self.model, participants, prompt)
         )
 
-        result = json.loads(response.choices[0].message.content)
-        return result["selected_participant"]
+        self._record(Usage.from_openai(response))
+        return _parse_selection(response)
+
+
+class AsyncOpenAIParticipantSelector(AbstractAsyncParticipantSelector):
+    provider = "openai"
+
+    async def _select_participant(self, participants, prompt):
+        response = await self.client.chat.completions.create(
+            **_selection_request(self.model, participants, prompt)
+        )
+
+        self._record(Usage.from_openai(response))
+        return _parse_selection(response)
 
 
 def create_openai_selector(
-    model: str = "gpt-4", api_key: str | None = None, max_messages: int = 10
+    model: str = "gpt-4",
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
 ):
     """Factory function that creates client and selector together."""
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise ImportError(
-            "openai package not installed. Install with: pip install openai"
-        )
-
-    client = OpenAI(api_key=api_key)
-    return OpenAIParticipantSelector(model, client, max_messages)
+    client = default_clients.openai(api_key)
+    return OpenAIParticipantSelector(model, client, max_messages, max_tokens)
 
 
 def create_openrouter_selector(
-    model: str, api_key: str | None = None, max_messages: int = 10
+    model: str,
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
 ):
     """Factory function for OpenRouter (uses OpenAI client with different base_url)."""
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise ImportError(
-            "openai package not installed. Install with: pip install openai"
-        )
+    client = default_clients.openai(api_key, OPENROUTER_BASE_URL)
+    selector = OpenAIParticipantSelector(model, client, max_messages, max_tokens)
+    selector.provider = "openrouter"
+    return selector
 
-    client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
-    return OpenAIParticipantSelector(model, client, max_messages)
+
+def create_async_openai_selector(
+    model: str = "gpt-4",
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
+):
+    """Factory function that creates async client and selector together."""
+    client = default_clients.openai(api_key, aio=True)
+    return AsyncOpenAIParticipantSelector(model, client, max_messages, max_tokens)
+
+
+def create_async_openrouter_selector(
+    model: str,
+    api_key: str | None = None,
+    max_messages: int = 10,
+    max_tokens: int | None = None,
+):
+    """Factory function for OpenRouter using the async OpenAI client."""
+    client = default_clients.openai(api_key, OPENROUTER_BASE_URL, aio=True)
+    selector = AsyncOpenAIParticipantSelector(model, client, max_messages, max_tokens)
+    selector.provider = "openrouter"
+    return selector
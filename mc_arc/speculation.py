@@ -0,0 +1,106 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from mc_arc.interfaces import AgentResponse, Message
+from mc_arc.usage import current_participant
+
+# picks the reply to commit among the finished candidate replies.
+Arbiter = Callable[[dict[str, str], list[Message]], str | Awaitable[str]]
+
+_UNSET = object()
+
+
+class PendingCommit:
+    """Applies a result once it is both produced and accepted."""
+
+    def __init__(self, apply: Callable[[Any], None]):
+        self.apply = apply
+        self.accepted = False
+        self.result = _UNSET
+
+    def resolve(self, result: Any):
+        self.result = result
+
+        if self.accepted:
+            self.apply(result)
+
+    def accept(self):
+        self.accepted = True
+
+        if self.result is not _UNSET:
+            self.apply(self.result)
+
+
+@dataclass
+class Draft:
+    """A reply generated without touching the participant state until commit."""
+
+    name: str
+    response: AgentResponse
+    commit: Callable[[], None]
+
+
+class _End:
+    def __init__(self, error: BaseException | None = None):
+        self.error = error
+
+
+class DraftRun:
+    """Consumes a draft response in the background, buffering its chunks."""
+
+    def __init__(self, draft: Draft):
+        self.draft = draft
+        self.chunks: list[str] = []
+        self.error: BaseException | None = None
+        self._queue: asyncio.Queue[str | _End] = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def name(self) -> str:
+        return self.draft.name
+
+    async def _run(self):
+        # the task runs in its own context, the speaker needs no reset.
+        current_participant.set(self.name)
+
+        try:
+            async for chunk in self.draft.response:
+                self.chunks.append(chunk)
+                self._queue.put_nowait(chunk)
+        except Exception as error:
+            self.error = error
+            self._queue.put_nowait(_End(error))
+        else:
+            self._queue.put_nowait(_End())
+
+    async def text(self) -> str:
+        await self._task
+
+        if self.error:
+            raise self.error
+
+        return "".join(self.chunks)
+
+    async def stream(self) -> AgentResponse:
+        try:
+            while not isinstance(item := await self._queue.get(), _End):
+                yield item
+        finally:
+            # a stream closed early, on interruption, stops the draft as well.
+            if not self._task.done():
+                await self.cancel()
+
+        if item.error:
+            raise item.error
+
+    async def cancel(self):
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            # the draft's cancellation is expected, the caller's own goes on.
+            if asyncio.current_task().cancelling():
+                raise
+        finally:
+            await self.draft.response.aclose()
@@ -0,0 +1,81 @@
+from collections.abc import Sequence
+from mc_arc.interfaces import Message
+
+
+class Timeline(Sequence[Message]):
+    """Shared list of messages read through per subscriber cursors.
+
+    Cursors are absolute offsets. Participant buffers and readers pulling the
+    timeline have separate cursors, a reader named after a participant does
+    not consume its buffer. With reclaim enabled, the prefix every cursor has
+    moved past is dropped, indexing and iteration only cover what is left.
+    """
+
+    def __init__(self, reclaim: bool = False):
+        self.reclaim = reclaim
+        self.start = 0
+        self.messages: list[Message] = []
+        self.cursors: dict[str, int] = {}
+        self.readers: dict[str, int] = {}
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.messages)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __getitem__(self, index):
+        return self.messages[index]
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def append(self, message: Message) -> int:
+        self.messages.append(message)
+
+        return self.end - 1
+
+    def subscribe(self, subscriber: str):
+        self.cursors.setdefault(subscriber, self.end)
+
+    def since(self, subscriber: str, exclude: str | None = None) -> list[Message]:
+        start = max(self.cursors.get(subscriber, self.start) - self.start, 0)
+
+        if exclude is None:
+            return self.messages[start:]
+
+        return [m for m in self.messages[start:] if m.name != exclude]
+
+    def advance(self, subscriber: str, end: int | None = None):
+        self.cursors[subscriber] = self.end if end is None else end
+
+        if self.reclaim:
+            self._reclaim()
+
+    def add_reader(self, reader: str, start: int | None = None):
+        """Registers a reader, reclaim keeps the messages it has not pulled.
+
+        Readers start at the oldest message still held unless given a start.
+        """
+        self.readers.setdefault(reader, self.start if start is None else start)
+
+    def pull(self, reader: str) -> list[Message]:
+        # readers pulling without registering start from what is left.
+        self.add_reader(reader)
+
+        messages = self.messages[max(self.readers[reader] - self.start, 0) :]
+        self.readers[reader] = self.end
+
+        if self.reclaim:
+            self._reclaim()
+
+        return messages
+
+    def _reclaim(self):
+        reclaimable = min([*self.cursors.values(), *self.readers.values()]) - self.start
+
+        # only compact once half of the list is dead so appends stay amortized O(1).
+        if reclaimable > 0 and reclaimable * 2 >= len(self.messages):
+            del self.messages[:reclaimable]
+            self.start += reclaimable
@@ -0,0 +1,52 @@
+from typing import Callable, Sequence
+from mc_arc.interfaces import Message
+
+TokenEstimator = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    # roughly 4 characters per token for english text with common tokenizers.
+    return (len(text) + 3) // 4
+
+
+def message_tokens(
+    message: Message, estimator: TokenEstimator = estimate_tokens
+) -> int:
+    if message.tokens is None:
+        message.tokens = estimator(str(message))
+
+    return message.tokens
+
+
+def output_budget(input_tokens: int, maximum: int | None = None) -> int:
+    # a rephrased report is about as long as its input, keep some headroom.
+    budget = input_tokens * 3 // 2 + 64
+
+    # models reject requests asking for more than their output limit.
+    return min(budget, maximum) if maximum else budget
+
+
+def token_window(
+    messages: Sequence[Message], max_messages: int, max_tokens: int | None = None
+) -> list[Message]:
+    """Keep the newest messages within max_messages and the optional max_tokens."""
+    if max_messages <= 0:
+        return []
+
+    if max_tokens is None:
+        return list(messages[-max_messages:])
+
+    window = []
+    tokens = 0
+
+    for message in reversed(messages):
+        tokens += message_tokens(message)
+
+        if tokens > max_tokens or len(window) == max_messages:
+            break
+
+        window.append(message)
+
+    window.reverse()
+
+    return window
@@ -0,0 +1,248 @@
+import contextvars
+from dataclasses import dataclass, fields
+from typing import Any, Hashable
+from mc_arc.interfaces import Reporter, AsyncReporter
+from mc_arc.limits import current_session
+
+# the participant on whose behalf provider requests are made, for attribution.
+current_participant: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_participant", default=None
+)
+
+SELECTOR = "selector"
+REPORTER = "reporter"
+SPEAKER = "speaker"
+
+
+def _tokens(source: Any, *names: str) -> int:
+    # the first attribute set among names, usage objects differ across versions.
+    for name in names:
+        value = getattr(source, name, None)
+
+        if value is not None:
+            return value
+
+    return 0
+
+
+@dataclass
+class Usage:
+    """Normalized token usage, input tokens include the cached ones."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    requests: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, other: "Usage"):
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    @classmethod
+    def from_openai(cls, response) -> "Usage | None":
+        usage = getattr(response, "usage", None)
+
+        if usage is None:
+            return None
+
+        details = getattr(usage, "prompt_tokens_details", None)
+
+        return cls(
+            input_tokens=_tokens(usage, "prompt_tokens"),
+            output_tokens=_tokens(usage, "completion_tokens"),
+            cached_tokens=_tokens(details, "cached_tokens"),
+            requests=1,
+        )
+
+    @classmethod
+    def from_anthropic(cls, response) -> "Usage | None":
+        usage = getattr(response, "usage", None)
+
+        if usage is None:
+            return None
+
+        # anthropic input tokens exclude the cache reads and writes.
+        cached = _tokens(usage, "cache_read_input_tokens")
+        written = _tokens(usage, "cache_creation_input_tokens")
+
+        return cls(
+            input_tokens=_tokens(usage, "input_tokens") + cached + written,
+            output_tokens=_tokens(usage, "output_tokens"),
+            cached_tokens=cached,
+            requests=1,
+        )
+
+    @classmethod
+    def from_gemini(cls, response) -> "Usage | None":
+        usage = getattr(response, "usage_metadata", None)
+
+        if usage is None:
+            return None
+
+        return cls(
+            input_tokens=_tokens(usage, "prompt_token_count"),
+            output_tokens=_tokens(usage, "candidates_token_count"),
+            cached_tokens=_tokens(usage, "cached_content_token_count"),
+            requests=1,
+        )
+
+    @classmethod
+    def from_pydantic_ai(cls, usage) -> "Usage | None":
+        if usage is None:
+            return None
+
+        return cls(
+            input_tokens=_tokens(usage, "input_tokens", "request_tokens"),
+            output_tokens=_tokens(usage, "output_tokens", "response_tokens"),
+            cached_tokens=_tokens(usage, "cache_read_tokens"),
+            requests=_tokens(usage, "requests") or 1,
+        )
+
+
+@dataclass
+class Price:
+    """Price per million tokens, cached input defaults to the input price."""
+
+    input: float
+    output: float
+    cached: float | None = None
+
+    def cost(self, usage: Usage) -> float:
+        cached = self.input if self.cached is None else self.cached
+        uncached = usage.input_tokens - usage.cached_tokens
+
+        return (
+            uncached * self.input
+            + usage.cached_tokens * cached
+            + usage.output_tokens * self.output
+        ) / 1e6
+
+
+@dataclass
+class Budget:
+    """Token and cost limits, and what to do once one is exceeded.
+
+    - "skip": reports are replaced by the plain list of messages.
+    - "downgrade": reports are made by `reporter`, or skipped without one.
+    - "stop": the participant stops speaking, or the session stops.
+    """
+
+    max_tokens: int | None = None
+    max_cost: float | None = None
+    action: str = "skip"
+    reporter: Reporter | AsyncReporter | None = None
+
+    def __post_init__(self):
+        if self.action not in ("skip", "downgrade", "stop"):
+            raise ValueError(f"Unknown budget action {self.action}.")
+
+    def exceeded(self, usage: Usage) -> bool:
+        if self.max_tokens is not None and usage.total_tokens > self.max_tokens:
+            return True
+
+        return self.max_cost is not None and usage.cost > self.max_cost
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, budget: Budget, session: Hashable = None):
+        super().__init__(f"Budget exceeded for session {session}.")
+        self.budget = budget
+        self.session = session
+
+
+class UsageTracker:
+    """Token usage and cost per session, participant and role.
+
+    Budgets apply to a session, a participant or both, None matching every
+    session or participant. Their spending is kept up to date on record so
+    checking them costs a lookup per budget.
+    """
+
+    def __init__(self, prices: dict[str, Price] | None = None):
+        # keyed by "provider/model" or by model alone.
+        self.prices: dict[str, Price] = dict(prices or {})
+        self.usage: dict[tuple[Hashable, str | None, str], Usage] = {}
+        self.budgets: dict[tuple[Hashable, str | None], Budget] = {}
+        self.spent: dict[tuple[Hashable, str | None], Usage] = {}
+
+    def set_price(self, model: str, price: Price):
+        self.prices[model] = price
+
+    def set_budget(
+        self, budget: Budget, session: Hashable = None, participant: str | None = None
+    ):
+        key = (session, participant)
+        self.budgets[key] = budget
+        self.spent[key] = self.total(session, participant)
+
+    def record(self, role: str, provider: str, model: str | None, usage: Usage | None):
+        if usage is None:
+            return
+
+        price = self.prices.get(f"{provider}/{model}") or self.prices.get(model)
+
+        if price:
+            usage.cost = price.cost(usage)
+
+        session = current_session.get()
+        participant = current_participant.get() if role != SELECTOR else None
+        key = (session, participant, role)
+
+        self.usage.setdefault(key, Usage()).add(usage)
+
+        for s, p in self.budgets:
+            if (s is None or s == session) and (p is None or p == participant):
+                self.spent[(s, p)].add(usage)
+
+    def total(
+        self,
+        session: Hashable = None,
+        participant: str | None = None,
+        role: str | None = None,
+    ) -> Usage:
+        total = Usage()
+
+        for (s, p, r), usage in self.usage.items():
+            if (
+                (session is None or s == session)
+                and (participant is None or p == participant)
+                and (role is None or r == role)
+            ):
+                total.add(usage)
+
+        return total
+
+    def exceeded(
+        self,
+        session: Hashable = None,
+        participant: str | None = None,
+        action: str | None = None,
+    ) -> Budget | None:
+        """The first exceeded budget covering the session and participant.
+
+        Without participant only the budgets of whole sessions are checked.
+        """
+        for (s, p), budget in self.budgets.items():
+            if (
+                (s is None or s == session)
+                and (p is None or p == participant)
+                and (action is None or budget.action == action)
+                and budget.exceeded(self.spent[(s, p)])
+            ):
+                return budget
+
+        return None
+
+    def reset(self):
+        self.usage.clear()
+
+        for key in self.spent:
+            self.spent[key] = Usage()
+
+
+default_usage = UsageTracker()
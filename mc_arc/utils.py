@@ -0,0 +1,48 @@
+import functools
+import importlib
+import inspect
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+async def maybe_await(value: T | Awaitable[T]) -> T:
+    """Await the value returned by an async callable, pass others through."""
+    if inspect.isawaitable(value):
+        return await value
+
+    return value
+
+
+def is_async_callable(fn) -> bool:
+    """Whether calling fn returns a coroutine, for functions and callable objects."""
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(
+        getattr(fn, "__call__", None)
+    )
+
+
+def lazy_exports(package: str, exports: dict[str, str]):
+    """Build the module __getattr__ and __dir__ importing submodules on first use.
+
+    `exports` maps every lazily exported name to its relative module.
+    """
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        module = exports.get(name)
+
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module, package), name)
+        module_globals[name] = value
+
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,63 @@
+import asyncio
+
+
+class FakeAgent:
+    """Agent adapter streaming fixed chunks, with draft support.
+
+    It can wait `delay` seconds before each chunk, fail with `error` after
+    its chunks or stall forever. `streamed` is set once every chunk was
+    pulled, `closed` counts the streams that ended.
+    """
+
+    def __init__(
+        self,
+        chunks: tuple[str, ...] = ("hello", " there"),
+        delay: float = 0.0,
+        error: Exception | None = None,
+        stall: bool = False,
+    ):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+        self.stall = stall
+        self.prompts: list[str] = []
+        self.started = asyncio.Event()
+        self.streamed = asyncio.Event()
+        self.closed = 0
+        self.accepted = 0
+
+    def __call__(self, prompt: str):
+        self.prompts.append(prompt)
+        return self._stream()
+
+    def draft(self, prompt: str):
+        return self(prompt), self._accept
+
+    def _accept(self):
+        self.accepted += 1
+
+    async def _stream(self):
+        self.started.set()
+
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield chunk
+
+            self.streamed.set()
+
+            if self.error:
+                raise self.error
+
+            if self.stall:
+                await asyncio.Event().wait()
+        finally:
+            self.closed += 1
+
+
+class FailingReporter:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def __call__(self, participant, messages):
+        raise self.error
@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+from fakes import FakeAgent
+from mc_arc import MasterOfCeremony, Participant
+
+
+class HeldReporter:
+    """Incremental reporter recording its calls, each held until released."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.running = 0
+        self.max_running = 0
+        self.called = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, participant, messages):
+        return await self.extend(participant, "", messages)
+
+    async def extend(self, participant, briefing, messages):
+        self.calls.append([message.content for message in messages])
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.called.set()
+
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+
+        return " ".join([briefing, *self.calls[-1]]).strip()
+
+
+class BriefingTest(unittest.IsolatedAsyncioTestCase):
+    def room(self) -> tuple[MasterOfCeremony, Participant, HeldReporter]:
+        reporter = HeldReporter()
+        participant = Participant("a", FakeAgent(), reporter, incremental=True)
+        mc = MasterOfCeremony(participants=[participant])
+
+        return mc, participant, reporter
+
+    async def test_briefs_in_the_background(self):
+        mc, participant, reporter = self.room()
+
+        mc.add_message("human", "m0")
+        await asyncio.sleep(0)
+        mc.add_message("human", "m1")
+        await participant._briefing_task
+
+        self.assertEqual(participant.briefing, "m0 m1")
+        self.assertEqual([m for call in reporter.calls for m in call], ["m0", "m1"])
+
+    async def test_reply_waits_only_for_its_own_messages(self):
+        mc, participant, reporter = self.room()
+        reporter.release.clear()
+
+        mc.add_message("human", "m0")
+        await reporter.called.wait()
+
+        reply = asyncio.create_task(participant.reply())
+        await asyncio.sleep(0)
+
+        # committed while the reply waits, they are left for the next turn.
+        mc.add_message("human", "m1")
+        mc.add_message("human", "m2")
+        reporter.release.set()
+        await reply
+
+        self.assertEqual(reporter.calls, [["m0"]])
+        self.assertEqual(
+            [m.content for m in participant.message_buffer], ["m1", "m2"]
+        )
+
+    async def test_no_background_briefing_during_the_inline_one(self):
+        mc, participant, reporter = self.room()
+        reporter.release.clear()
+
+        # the reply briefs m0 inline, the messages committed meanwhile must
+        # not start a concurrent background briefing.
+        reply = asyncio.create_task(participant.reply())
+        mc.add_message("human", "m0")
+        await reporter.called.wait()
+
+        for i in range(1, 4):
+            mc.add_message("human", f"m{i}")
+            await asyncio.sleep(0)
+
+        reporter.release.set()
+        await reply
+        await asyncio.sleep(0)
+
+        self.assertEqual(reporter.max_running, 1)
+        self.assertEqual(reporter.calls, [["m0"]])
+
+    async def test_failed_background_briefing_is_retried_on_reply(self):
+        mc, participant, reporter = self.room()
+        extend = reporter.extend
+        failures = [RuntimeError("provider")]
+
+        async def flaky(name, briefing, messages):
+            if failures:
+                raise failures.pop()
+
+            return await extend(name, briefing, messages)
+
+        reporter.extend = flaky
+
+        mc.add_message("human", "m0")
+        await asyncio.sleep(0)
+        await participant.reply()
+
+        self.assertEqual(reporter.calls, [["m0"]])
+        self.assertEqual(participant.message_buffer, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import unittest
+from fakes import FakeAgent
+from mc_arc import Coalescing, MasterOfCeremony, Participant
+
+
+class Gate:
+    """Async selector or reporter waiting until it is opened."""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.entered = asyncio.Event()
+        self.opened = asyncio.Event()
+
+    async def __call__(self, first, messages):
+        self.entered.set()
+        await self.opened.wait()
+        return self.result if self.result is not None else first[0]
+
+
+class InterruptTest(unittest.IsolatedAsyncioTestCase):
+    def room(self, agent: FakeAgent, selector=None, reporter=None):
+        mc = MasterOfCeremony(selector)
+        mc.add_participant(Participant("a", agent, reporter))
+        mc.add_message("human", "hi")
+
+        return mc
+
+    def contents(self, mc: MasterOfCeremony) -> list[str]:
+        return [str(message) for message in mc.timeline]
+
+    async def test_nothing_to_interrupt(self):
+        mc = self.room(FakeAgent())
+
+        self.assertFalse(mc.interrupt())
+
+    async def test_barge_in_during_selection(self):
+        agent = FakeAgent()
+        selector = Gate()
+        mc = self.room(agent, selector=selector)
+
+        async def barge_in():
+            await selector.entered.wait()
+            mc.add_message("human", "stop", interrupt=True)
+
+        task = asyncio.create_task(barge_in())
+
+        async with mc.step() as stream:
+            chunks = [chunk async for chunk in stream]
+
+        await task
+
+        self.assertEqual(chunks, [])
+        self.assertEqual(agent.prompts, [])
+        self.assertEqual(self.contents(mc), ["human: hi", "human: stop"])
+        self.assertEqual(asyncio.current_task().cancelling(), 0)
+
+        # the next step runs normally.
+        selector.opened.set()
+
+        async with mc.step() as stream:
+            chunks = [chunk async for chunk in stream]
+
+        self.assertEqual(chunks, [("a", "hello"), ("a", " there")])
+
+    async def test_barge_in_while_reporting(self):
+        agent = FakeAgent()
+        reporter = Gate("report")
+        mc = self.room(agent, reporter=reporter)
+        cursor = mc.timeline.cursors["a"]
+
+        async def barge_in():
+            await reporter.entered.wait()
+            mc.add_message("human", "stop", interrupt=True)
+
+        task = asyncio.create_task(barge_in())
+
+        async with mc.step() as stream:
+            chunks = [chunk async for chunk in stream]
+
+        await task
+
+        self.assertEqual(chunks, [])
+        self.assertEqual(agent.prompts, [])
+        self.assertEqual(mc.timeline.cursors["a"], cursor)
+
+    async def test_barge_in_while_streaming(self):
+        agent = FakeAgent(("one", " two", " three"))
+        mc = self.room(agent)
+        chunks = []
+
+        async with mc.step() as stream:
+            async for _, chunk in stream:
+                chunks.append(chunk)
+
+                if len(chunks) == 2:
+                    mc.add_message("human", "stop", interrupt=True)
+
+        self.assertEqual(chunks, ["one", " two"])
+        self.assertEqual(agent.closed, 1)
+        self.assertEqual(
+            self.contents(mc),
+            ["human: hi", "a: one two [interrupted]", "human: stop"],
+        )
+
+    async def test_interrupt_wakes_a_consumer_waiting_on_a_stall(self):
+        agent = FakeAgent(("partial",), stall=True)
+        mc = self.room(agent)
+        chunks = []
+
+        async def barge_in():
+            while not chunks:
+                await asyncio.sleep(0.001)
+
+            mc.interrupt()
+
+        task = asyncio.create_task(barge_in())
+
+        async with asyncio.timeout(1):
+            async with mc.step() as stream:
+                async for _, chunk in stream:
+                    chunks.append(chunk)
+
+        await task
+
+        self.assertEqual(agent.closed, 1)
+        self.assertEqual(self.contents(mc)[-1], "a: partial [interrupted]")
+        self.assertEqual(asyncio.current_task().cancelling(), 0)
+
+    async def test_interrupt_commits_coalesced_text(self):
+        agent = FakeAgent(("not ", "yet ", "flushed"), stall=True)
+        mc = self.room(agent)
+        coalescing = Coalescing(max_chars=1000, max_delay=10)
+
+        async def barge_in():
+            # read from the provider, but neither flushed nor yielded yet.
+            await agent.streamed.wait()
+            mc.add_message("human", "stop", interrupt=True)
+
+        async with mc.step(coalescing=coalescing) as stream:
+            task = asyncio.create_task(barge_in())
+            chunks = [chunk async for chunk in stream]
+
+        await task
+
+        self.assertEqual(chunks, [])
+        self.assertEqual(
+            self.contents(mc),
+            ["human: hi", "a: not yet flushed [interrupted]", "human: stop"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+from mc_arc.memory import HashingEmbedder, InMemoryStore, VectorMemory
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.batches: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        return super().__call__(texts)
+
+
+class VectorMemoryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.embedder = CountingEmbedder()
+        self.memory = VectorMemory(InMemoryStore(), self.embedder, batch_size=2)
+
+        await self.memory.load(
+            ["the station orbits a gas giant", "the reactor is in the lower deck"],
+            {
+                "ava": ["ava repaired the reactor", "ava hates the cold"],
+                "ben": ["ben pilots the shuttle"],
+            },
+        )
+
+    async def test_search_ranks_world_and_own_facts(self):
+        hits = await self.memory.search("ava", "who repaired the reactor", limit=2)
+
+        self.assertEqual(hits[0][0], "ava repaired the reactor")
+        self.assertEqual(hits[1][0], "the reactor is in the lower deck")
+        self.assertLessEqual(hits[0][1], hits[1][1])
+
+    async def test_search_ignores_other_characters(self):
+        hits = await self.memory.search("ben", "ava repaired the reactor", limit=5)
+        facts = [fact for fact, _ in hits]
+
+        self.assertNotIn("ava repaired the reactor", facts)
+        self.assertIn("ben pilots the shuttle", facts)
+
+    async def test_embeds_in_batches(self):
+        self.assertTrue(all([len(batch) <= 2 for batch in self.embedder.batches]))
+
+    async def test_query_vector_is_cached(self):
+        self.embedder.batches.clear()
+
+        await asyncio.gather(
+            self.memory.search("ava", "the cold"),
+            self.memory.search("ben", "the cold"),
+        )
+        await self.memory.search("ava", "the cold")
+
+        self.assertLessEqual(len(self.embedder.batches), 2)
+        self.assertGreaterEqual(self.memory.cache.hits, 1)
+
+    async def test_overwrite_replaces_facts(self):
+        await self.memory.ingest("ben", ["ben lost the shuttle"], overwrite=True)
+
+        hits = await self.memory.search("ben", "shuttle", limit=5)
+        facts = [fact for fact, _ in hits]
+
+        self.assertIn("ben lost the shuttle", facts)
+        self.assertNotIn("ben pilots the shuttle", facts)
+
+    async def test_tool_lists_facts(self):
+        read_memory = self.memory.tool("ava")
+
+        text = await read_memory("cold")
+
+        self.assertTrue(text.startswith("- "))
+        self.assertIn("- ava hates the cold", text.splitlines())
+
+
+class HashingEmbedderTest(unittest.TestCase):
+    def test_same_words_same_vector(self):
+        embedder = HashingEmbedder(dimensions=32)
+
+        a, b, c = embedder(["Hello world", "world, hello!", "goodbye"])
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(len(a), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
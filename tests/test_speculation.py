@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from fakes import FailingReporter, FakeAgent
+from mc_arc import MasterOfCeremony, Participant
+from mc_arc.speculation import Draft, DraftRun
+
+
+async def consume(mc: MasterOfCeremony) -> list[tuple[str, str]]:
+    async with mc.step() as stream:
+        return [(name, chunk) async for name, chunk in stream]
+
+
+class SpeculationTest(unittest.IsolatedAsyncioTestCase):
+    def room(self, agents: dict[str, FakeAgent], **options) -> MasterOfCeremony:
+        mc = MasterOfCeremony(speculative=len(agents), **options)
+
+        for name, agent in agents.items():
+            mc.add_participant(Participant(name, agent))
+
+        mc.add_message("human", "hi")
+
+        return mc
+
+    async def test_draft_failing_to_start_closes_the_others(self):
+        agents = {"a": FakeAgent(stall=True), "b": FakeAgent(stall=True)}
+        mc = self.room(agents)
+        mc.participants["b"].reporter = FailingReporter(RuntimeError("report"))
+        cursors = dict(mc.timeline.cursors)
+
+        with self.assertRaisesRegex(RuntimeError, "report"):
+            await consume(mc)
+
+        self.assertEqual(agents["a"].closed, 1)
+        self.assertEqual(agents["a"].accepted, 0)
+        self.assertEqual(mc.timeline.cursors, cursors)
+        self.assertEqual([m.name for m in mc.timeline], ["human"])
+
+    async def test_failed_draft_loses_to_a_finished_one(self):
+        agents = {
+            "a": FakeAgent(("partial",), error=RuntimeError("stream")),
+            "b": FakeAgent(("fine",), delay=0.01),
+        }
+        mc = self.room(agents, arbiter=lambda replies, timeline: "a")
+        cursor = mc.timeline.cursors["a"]
+
+        chunks = await consume(mc)
+
+        self.assertEqual(chunks, [("b", "fine")])
+        self.assertEqual([m.content for m in mc.timeline], ["hi", "fine"])
+        self.assertEqual((agents["a"].accepted, agents["b"].accepted), (0, 1))
+        self.assertEqual((agents["a"].closed, agents["b"].closed), (1, 1))
+        self.assertEqual(mc.timeline.cursors["a"], cursor)
+
+    async def test_every_draft_failing_raises(self):
+        agents = {
+            "a": FakeAgent((), error=RuntimeError("a")),
+            "b": FakeAgent((), error=RuntimeError("b")),
+        }
+        mc = self.room(agents, arbiter=lambda replies, timeline: "a")
+
+        with self.assertRaises(RuntimeError):
+            await consume(mc)
+
+        self.assertEqual((agents["a"].accepted, agents["b"].accepted), (0, 0))
+        self.assertEqual([m.name for m in mc.timeline], ["human"])
+
+    async def test_losers_are_closed(self):
+        agents = {"a": FakeAgent(("a",)), "b": FakeAgent(stall=True)}
+        mc = self.room(agents)
+        mc.selector = lambda names, timeline: "a"
+
+        chunks = await consume(mc)
+
+        self.assertEqual(chunks, [("a", "a")])
+        self.assertEqual((agents["a"].accepted, agents["b"].accepted), (1, 0))
+        self.assertEqual(agents["b"].closed, 1)
+
+
+class DraftRunTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancel_closes_the_response(self):
+        agent = FakeAgent(stall=True)
+        run = DraftRun(Draft("a", agent("prompt"), lambda: None))
+        await agent.started.wait()
+
+        await run.cancel()
+
+        self.assertEqual(agent.closed, 1)
+
+    async def test_cancel_keeps_the_caller_cancellation(self):
+        stopping = asyncio.Event()
+
+        async def slow_to_stop():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                stopping.set()
+                await asyncio.sleep(0.05)
+                raise
+
+            yield ""
+
+        run = DraftRun(Draft("a", slow_to_stop(), lambda: None))
+        await asyncio.sleep(0)
+
+        caller = asyncio.create_task(run.cancel())
+        await stopping.wait()
+        caller.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+
+
+if __name__ == "__main__":
+    unittest.main()